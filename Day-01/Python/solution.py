@@ -1,75 +1,285 @@
-import sys
+import functools
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+from aoc.days import call_in_module
+
+ENGINES = ('python', 'numpy', 'chunked')
+
+CHUNK_SIZE = 1 << 20
+
+
+@parse_cache
+def parse(path):
+    # Each rotation becomes a signed distance: positive for R, negative for L.
+    rotations = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            direction = line[0]
+            distance = int(line[1:])
+
+            if direction == 'R':
+                rotations.append(distance)
+            elif direction == 'L':
+                rotations.append(-distance)
+    return rotations
+
+@parse_cache
+def parse_array(path):
+    """Bulk-parse the rotations into a signed int64 NumPy array, without a
+    Python-level loop over lines."""
+    if np is None:
+        raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+    raw = np.fromfile(path, dtype=np.uint8)
+    if not len(raw):
+        return np.zeros(0, dtype=np.int64)
+
+    # Line boundaries, trimmed of surrounding whitespace (as str.strip()
+    # does in the python engine) and skipping blank lines.
+    ends = np.flatnonzero(raw == ord('\n'))
+    if raw[-1] != ord('\n'):
+        ends = np.append(ends, len(raw))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    space = np.zeros(256, dtype=bool)
+    space[list(b' \t\r\f\v')] = True
+    starts = skip_spaces(raw, starts, ends, space)
+    while True:
+        trailing = (ends > starts) & space[raw[np.maximum(ends - 1, 0)]]
+        if not trailing.any():
+            break
+        ends = ends - trailing
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+
+    # Lines with another direction are skipped, as in the python engine.
+    directions = raw[starts]
+    keep = (directions == ord('R')) | (directions == ord('L'))
+    starts, ends, directions = starts[keep], ends[keep], directions[keep]
+
+    # The distance is everything after the direction, which int() would
+    # also accept with leading whitespace; anything but digits is an error.
+    digits_start = skip_spaces(raw, starts + 1, ends, space)
+    non_digits = np.concatenate(([0], np.cumsum((raw < ord('0')) | (raw > ord('9')))))
+    invalid = (digits_start == ends) | (non_digits[ends] > non_digits[digits_start])
+    if invalid.any():
+        i = int(np.argmax(invalid))
+        line = raw[starts[i]:ends[i]].tobytes().decode(errors='replace')
+        raise ValueError(f"invalid rotation: {line!r}")
+
+    # Horner's rule over the digit columns: one vectorized step per digit
+    # position rather than one Python step per line.
+    distances = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int((ends - digits_start).max(initial=0))):
+        pos = digits_start + k
+        active = pos < ends
+        digits = raw[np.minimum(pos, len(raw) - 1)].astype(np.int64) - ord('0')
+        distances = np.where(active, distances * 10 + digits, distances)
+
+    signs = np.where(directions == ord('R'), 1, -1)
+    return signs * distances
+
+def skip_spaces(raw, starts, ends, space):
+    """Advances each start past the whitespace bytes before its end."""
+    while True:
+        leading = (starts < ends) & space[raw[np.minimum(starts, len(raw) - 1)]]
+        if not leading.any():
+            return starts
+        starts = starts + leading
+
+def zero_hits_numpy(rotations):
+    positions = (50 + np.cumsum(rotations)) % 100
+    return int(np.count_nonzero(positions == 0))
 
-def part1(filename):
+def zero_crossings_numpy(rotations):
+    # Same floor-division counts as part2, for every rotation at once.
+    after = 50 + np.cumsum(rotations)
+    before = after - rotations
+    right = after // 100 - before // 100
+    left = (before - 1) // 100 - (after - 1) // 100
+    return int(np.where(rotations > 0, right, left).sum())
+
+def summarize_chunk(data):
+    """
+    Summarizes a run of rotation lines without knowing where the dial starts.
+
+    Both counts only depend on the starting position modulo 100, so the
+    summary is (net, hits, crossings) where net is the total displacement and
+    hits[r] / crossings[r] are the part1 / part2 counts for a chunk that
+    starts with the dial at r.
+    """
+    hits = [0] * 100
+    # Each rotation crosses zero distance // 100 times for every start, plus
+    # once more for a cyclic run of (distance % 100) starting positions;
+    # those runs are accumulated in a difference array.
+    diff = [0] * 101
+    base = 0
+    offset = 0
+    for line in data.split(b'\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        direction = line[0]
+        distance = int(line[1:])
+        q, m = divmod(distance, 100)
+
+        if direction == ord('R'):
+            # Extra crossing when (r + offset) % 100 + m >= 100.
+            first = (100 - m - offset) % 100
+            offset += distance
+        elif direction == ord('L'):
+            # Extra crossing when (r + offset - 1) % 100 < m.
+            first = (1 - offset) % 100
+            offset -= distance
+        else:
+            continue
+
+        base += q
+        if m:
+            last = first + m
+            diff[first] += 1
+            if last <= 100:
+                diff[last] -= 1
+            else:
+                diff[100] -= 1
+                diff[0] += 1
+                diff[last - 100] -= 1
+        hits[-offset % 100] += 1
+
+    crossings = []
+    running = base
+    for r in range(100):
+        running += diff[r]
+        crossings.append(running)
+    return offset, hits, crossings
+
+def combine_summaries(first, second):
+    """Summary of `first` followed by `second`. Associative, with identity
+    (0, [0] * 100, [0] * 100)."""
+    net1, hits1, crossings1 = first
+    net2, hits2, crossings2 = second
+    shift = net1 % 100
+    hits = [hits1[r] + hits2[(r + shift) % 100] for r in range(100)]
+    crossings = [crossings1[r] + crossings2[(r + shift) % 100] for r in range(100)]
+    return net1 + net2, hits, crossings
+
+def chunk_bounds(path, chunk_size=CHUNK_SIZE):
+    """Byte ranges of roughly chunk_size bytes, each ending on a line boundary."""
+    size = os.path.getsize(path)
+    bounds = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+def summarize_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return summarize_chunk(f.read(end - start))
+
+def summarize_file(path, chunk_size=CHUNK_SIZE, workers=1):
+    """
+    Summarizes the whole file chunk by chunk, holding one chunk in memory at
+    a time. With workers > 1 the chunks are summarized in a process pool and
+    merged in file order.
+    """
+    bounds = chunk_bounds(path, chunk_size)
+    summary = (0, [0] * 100, [0] * 100)
+    if workers > 1 and len(bounds) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            starts, ends = zip(*bounds)
+            # By path, so that spawned workers can import the function.
+            worker = functools.partial(call_in_module, __file__, 'summarize_range', path)
+            parts = pool.map(worker, starts, ends)
+            for part in parts:
+                summary = combine_summaries(summary, part)
+    else:
+        for start, end in bounds:
+            summary = combine_summaries(summary, summarize_range(path, start, end))
+    return summary
+
+def part1(filename, engine='python', workers=1):
     current_position = 50
     zero_count = 0
 
-    f = os.path.join('..', filename)
+    f = Path(__file__).resolve().parent.parent / filename
     try:
-        with open(f, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                direction = line[0]
-                distance = int(line[1:])
-
-                if direction == 'R':
-                    current_position = (current_position + distance) % 100
-                elif direction == 'L':
-                    current_position = (current_position - distance) % 100
-                
-                if current_position == 0:
-                    zero_count += 1
-        
-        print(zero_count)
+        if engine == 'numpy':
+            return zero_hits_numpy(parse_array(f))
+        if engine == 'chunked':
+            _, hits, _ = summarize_file(f, workers=workers)
+            return hits[50]
+        rotations = parse(f)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
 
-def part2(filename):
+    for distance in rotations:
+        current_position = (current_position + distance) % 100
+
+        if current_position == 0:
+            zero_count += 1
+
+    return zero_count
+
+def part2(filename, engine='python', workers=1):
     # current_position_unwrapped tracks the dial's position as if it were on an infinite number line,
     # allowing us to correctly count passes through 0 (or multiples of 100).
     current_position_unwrapped = 50
     zero_count = 0
 
-    f = os.path.join('..', filename)
+    f = Path(__file__).resolve().parent.parent / filename
     try:
-        with open(f, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                direction = line[0]
-                distance = int(line[1:])
-
-                if direction == 'R':
-                    # We are counting how many multiples of 100 are crossed when moving right.
-                    # We are counting how many '0's are hit in the range
-                    # (current_position_unwrapped, current_position_unwrapped + distance].
-                    # The number of such multiples is floor(B/100) - floor(A/100) for range (A, B].
-                    zero_count += (current_position_unwrapped + distance) // 100 - current_position_unwrapped // 100
-                    current_position_unwrapped += distance
-                elif direction == 'L':
-                    # We are counting how many multiples of 100 are crossed when moving left.
-                    # We are counting how many '0's are hit in the range
-                    # [current_position_unwrapped - distance, current_position_unwrapped).
-                    # The number of such multiples is (B-1)//100 - (A-1)//100 for range [A, B).
-                    zero_count += (current_position_unwrapped - 1) // 100 - (current_position_unwrapped - distance - 1) // 100
-                    current_position_unwrapped -= distance
-        
-        print(zero_count)
-
+        if engine == 'numpy':
+            return zero_crossings_numpy(parse_array(f))
+        if engine == 'chunked':
+            _, _, crossings = summarize_file(f, workers=workers)
+            return crossings[50]
+        rotations = parse(f)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
 
-if __name__ == "__main__":
-    part1("example")
-    part1("input")
-    part2("example")
-    part2("input")
+    for distance in rotations:
+        if distance > 0:
+            # We are counting how many multiples of 100 are crossed when moving right.
+            # We are counting how many '0's are hit in the range
+            # (current_position_unwrapped, current_position_unwrapped + distance].
+            # The number of such multiples is floor(B/100) - floor(A/100) for range (A, B].
+            zero_count += (current_position_unwrapped + distance) // 100 - current_position_unwrapped // 100
+        else:
+            # We are counting how many multiples of 100 are crossed when moving left.
+            # We are counting how many '0's are hit in the range
+            # [current_position_unwrapped - distance, current_position_unwrapped).
+            # The number of such multiples is (B-1)//100 - (A-1)//100 for range [A, B).
+            zero_count += (current_position_unwrapped - 1) // 100 - (current_position_unwrapped + distance - 1) // 100
+        current_position_unwrapped += distance
 
+    return zero_count
+
+if __name__ == "__main__":
+    print(part1("example"))
+    print(part1("input"))
+    print(part2("example"))
+    print(part2("input"))
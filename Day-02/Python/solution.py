@@ -1,35 +1,110 @@
+import heapq
+import sys
 from pathlib import Path
 
-def part1(filename):
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+from aoc.intervals import IntervalSet
+
+# 'arithmetic' sums the invalid IDs in closed form; 'generate' enumerates
+# candidates in ascending order and merges them against the ranges.
+ENGINES = ('arithmetic', 'generate')
+
+
+@parse_cache
+def parse(path):
+    return sorted(list(map(lambda r: tuple(map(int, r.split('-'))), open(path).read().strip().split(','))))
+
+def repeated_block_sum(lo, hi, block, length):
+    """
+    Sums the `length`-digit numbers in [lo, hi] made of a `block`-digit number
+    (no leading zero) repeated length // block times.
+
+    Those numbers are exactly x * R for R = 1 + 10**block + 10**(2*block) + ...,
+    so they form an arithmetic series in x.
+    """
+    r = (10**length - 1) // (10**block - 1)
+    x_lo = max(10**(block - 1), -(-lo // r))
+    x_hi = min(10**block - 1, hi // r)
+    if x_lo > x_hi:
+        return 0
+    return r * (x_lo + x_hi) * (x_hi - x_lo + 1) // 2
+
+def invalid_id_sum(lo, hi, any_repeats):
+    """
+    Sums the invalid IDs in [lo, hi]: numbers made of a block repeated twice,
+    or (any_repeats) repeated two or more times. Cost depends only on the
+    number of digits, not on the width of the range.
+    """
+    total = 0
+    for length in range(len(str(lo)), len(str(hi)) + 1):
+        a = max(lo, 10**(length - 1))
+        b = min(hi, 10**length - 1)
+        if a > b:
+            continue
+        if not any_repeats:
+            if length % 2 == 0:
+                total += repeated_block_sum(a, b, length // 2, length)
+            continue
+
+        # A number with a repeated block of size d also has one of every size
+        # that is a multiple of its shortest period. Inclusion-exclusion over
+        # the divisors: primitive[d] sums the numbers whose shortest period is
+        # exactly d (e.g. 1111 lands in primitive[1], not primitive[2]).
+        blocks = [d for d in range(1, length) if length % d == 0]
+        primitive = {}
+        for d in blocks:
+            primitive[d] = repeated_block_sum(a, b, d, length) - sum(
+                primitive[e] for e in blocks if e < d and d % e == 0)
+        total += sum(primitive.values())
+    return total
+
+def repeated_ids(max_digits, any_repeats):
+    """
+    Yields, in ascending order and without duplicates, every number of up to
+    `max_digits` digits made of a block repeated twice, or (any_repeats)
+    repeated two or more times.
+    """
+    for length in range(2, max_digits + 1):
+        if any_repeats:
+            blocks = [d for d in range(1, length) if length % d == 0]
+        else:
+            blocks = [length // 2] if length % 2 == 0 else []
+        # For a fixed length, each block size gives an ascending run x * R;
+        # merge the runs and drop numbers with more than one block size.
+        runs = []
+        for d in blocks:
+            r = (10**length - 1) // (10**d - 1)
+            runs.append(range(10**(d - 1) * r, 10**d * r, r))
+        previous = None
+        for n in heapq.merge(*runs):
+            if n != previous:
+                yield n
+            previous = n
+
+def part1(filename, engine='arithmetic'):
     f = Path(__file__).resolve().parent.parent / filename
-    ranges = sorted(list(map(lambda r: tuple(map(int, r.split('-'))), open(f).read().strip().split(','))))
+    ids = IntervalSet(parse(f))
 
-    def generate_invalid_ids():
-        for k in range(1, 6):
-            start_x = 1 if k == 1 else 10**(k-1)
-            for x in range(start_x, 10**k):
-                yield int(str(x) * 2)
+    if engine == 'arithmetic':
+        return sum(invalid_id_sum(s, e, False) for s, e in ids)
 
-    print(sum(filter(lambda inv_id: any(s <= inv_id <= e for s, e in ranges), generate_invalid_ids())))
+    return ids.sum_in(repeated_ids(len(str(ids.ends[-1])), False))
 
-def part2(filename):
+def part2(filename, engine='arithmetic'):
     f = Path(__file__).resolve().parent.parent / filename
-    ranges = sorted(list(map(lambda r: tuple(map(int, r.split('-'))), open(f).read().strip().split(','))))
+    ids = IntervalSet(parse(f))
 
-    def generate_invalid_ids():
-        # Limit generated numbers to a max of 12 digits total.
-        # This is a heuristic to keep generation finite, similar to part1's limit.
-        for k in range(1, 7): # Length of the repeating block of digits.
-            start_x = 1 if k == 1 else 10**(k-1)
-            for x in range(start_x, 10**k): # The number to be repeated.
-                s_x = str(x)
-                for n in range(2, 12 // k + 1): # Number of repetitions.
-                    yield int(s_x * n)
+    if engine == 'arithmetic':
+        return sum(invalid_id_sum(s, e, True) for s, e in ids)
 
-    print(sum(filter(lambda inv_id: any(s <= inv_id <= e for s, e in ranges), set(generate_invalid_ids()))))
+    return ids.sum_in(repeated_ids(len(str(ids.ends[-1])), True))
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
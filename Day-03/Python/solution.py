@@ -1,56 +1,108 @@
+import sys
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
 
-def get_max_joltage_12_digits(s):
-    k = 12
-    n = len(s)
-    if n < k:
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+
+ENGINES = ('python', 'numpy')
+
+
+def max_joltage(bank, k):
+    """
+    Largest k-digit number formed by keeping k of the bank's digits in order,
+    or 0 if the bank has fewer than k digits. `bank` is a bytes line of ASCII
+    digits; a monotonic stack finds the answer in one pass for any k.
+    """
+    drop = len(bank) - k
+    if drop < 0:
         return 0
-    
-    result_digits = []
-    current_search_start_idx = 0
-    
-    for i in range(k):
-        # Calculate the actual end index for the current search window
-        # The window must be large enough to guarantee k-i more characters to pick
-        search_window_end_idx = n - (k - i) 
-        
-        search_slice = s[current_search_start_idx : search_window_end_idx + 1]
-        max_digit_char = max(search_slice)
-        max_digit_idx = s.index(max_digit_char, current_search_start_idx)
-                
-        result_digits.append(max_digit_char)
-        current_search_start_idx = max_digit_idx + 1
-        
-    return int("".join(result_digits))
-
-
-def part1(filename):
-    f = Path(__file__).resolve().parent.parent / filename
-    total_output_joltage = 0
-    with open(f, 'r') as file:
-        for line in file:
-            line = line.strip()
-            max_bank_joltage = max((int(line[i] + line[j]) for i in range(len(line)) for j in range(i + 1, len(line))), default=0)
+    stack = bytearray()
+    for digit in bank:
+        # A larger digit replaces smaller ones before it while we can still
+        # afford to throw digits away.
+        while drop and stack and stack[-1] < digit:
+            stack.pop()
+            drop -= 1
+        stack.append(digit)
+    return int(stack[:k])
+
 
-            total_output_joltage += max_bank_joltage
+@parse_cache
+def parse(path):
+    with open(path, 'rb') as file:
+        return [line.strip() for line in file if line.strip()]
 
-    print(total_output_joltage)
 
+@parse_cache
+def parse_matrices(path):
+    """
+    The banks as uint8 matrices of ASCII digits, one row per bank and one
+    matrix per bank width. When every bank has the same width (the usual
+    case) the file is reshaped in place with np.frombuffer.
+    """
+    if np is None:
+        raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+    with open(path, 'rb') as file:
+        raw = file.read().replace(b'\r', b'')
+    if not raw.endswith(b'\n'):
+        raw += b'\n'
+    width = raw.index(b'\n') if raw.strip() else 0
+    if width and len(raw) % (width + 1) == 0 and raw[width::width + 1] == b'\n' * (len(raw) // (width + 1)):
+        return [np.frombuffer(raw, dtype=np.uint8).reshape(-1, width + 1)[:, :width]]
 
-def part2(filename):
+    by_width = {}
+    for bank in parse(path):
+        by_width.setdefault(len(bank), []).append(bank)
+    return [np.frombuffer(b''.join(banks), dtype=np.uint8).reshape(len(banks), width)
+            for width, banks in sorted(by_width.items())]
+
+def total_joltage_numpy(matrices, k):
+    """
+    Sum of max_joltage(bank, k) over every bank, choosing the k digits for all
+    banks of a matrix at once: step i takes the leftmost largest digit in each
+    row's window [after the previous pick, width - k + i].
+    """
+    total = 0
+    for digits in matrices:
+        rows, width = digits.shape
+        if width < k or rows == 0:
+            continue
+        cols = np.arange(width)
+        start = np.zeros(rows, dtype=np.intp)
+        for i in range(k):
+            window = (cols >= start[:, None]) & (cols <= width - k + i)
+            # 0 is below every ASCII digit, and argmax returns the first maximum.
+            pick = np.argmax(np.where(window, digits, 0), axis=1)
+            chosen = digits[np.arange(rows), pick].astype(np.int64) - ord('0')
+            # Summing per digit position keeps the totals exact for any k.
+            total += int(chosen.sum()) * 10**(k - 1 - i)
+            start = pick + 1
+    return total
+
+
+def part1(filename, engine='python'):
     f = Path(__file__).resolve().parent.parent / filename
-    with open(f, 'r') as file:
-        total_output_joltage = sum(
-            get_max_joltage_12_digits(line.strip())
-            for line in file
-            if line.strip() and len(line.strip()) >= 12
-        )
+    if engine == 'numpy':
+        return total_joltage_numpy(parse_matrices(f), 2)
+    return sum(max_joltage(bank, 2) for bank in parse(f))
 
-    print(total_output_joltage)
+
+def part2(filename, engine='python'):
+    f = Path(__file__).resolve().parent.parent / filename
+    if engine == 'numpy':
+        return total_joltage_numpy(parse_matrices(f), 12)
+    return sum(max_joltage(bank, 12) for bank in parse(f))
 
 if __name__=="__main__":
-    part1("example")
-    part1("input")
-    part2("example")
-    part2("input")
+    print(part1("example"))
+    print(part1("input"))
+    print(part2("example"))
+    print(part2("input"))
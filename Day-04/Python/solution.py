@@ -1,27 +1,157 @@
+import sys
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
 
-def part1(filename):
-    f = Path(__file__).resolve().parent.parent / filename
-    with open(f, 'r') as f:
-        grid_lines = [line.strip() for line in f]
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc import instrument
+from aoc.cache import parse_cache
+
+# 'python' counts neighbors in plain loops and, in part2, removes rolls from a
+# worklist; 'sweep' rescans the whole grid each round (part2 only); 'numpy'
+# does both parts with whole-array operations; 'bitset' packs each row into
+# one int.
+ENGINES = {1: ('python', 'numpy', 'bitset'), 2: ('python', 'sweep', 'numpy', 'bitset')}
+
+
+@parse_cache
+def parse(path):
+    with open(path, 'r') as f:
+        # Read lines and strip trailing newlines
+        grid_lines = [line.rstrip('\n') for line in f]
 
-    # Normalize the Grid: Find the maximum width
     if not grid_lines:
-        return # Or raise an error, depending on desired behavior for empty files
-    
+        return []
+
+    # Normalize the Grid: pad shorter rows with '.' so the grid is a perfect rectangle.
+    # Rows are kept as strings so the shared result can't be modified by a part.
     max_cols = max(len(line) for line in grid_lines)
-    
-    grid = []
-    for line in grid_lines:
-        row = list(line)
-        # Pad shorter rows with '.' so the grid is a perfect rectangle
-        while len(row) < max_cols:
-            row.append('.')
-        grid.append(row)
+    return [line.ljust(max_cols, '.') for line in grid_lines]
+
+
+@parse_cache
+def parse_array(path):
+    """
+    The grid as a uint8 array with 1 for a roll, padded with a border of
+    empty cells so every neighbor is a plain slice.
+    """
+    if np is None:
+        raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+    grid_lines = parse(path)
+    if not grid_lines:
+        return None
+    rows, cols = len(grid_lines), len(grid_lines[0])
+    raw = np.frombuffer(''.join(grid_lines).encode(), dtype=np.uint8).reshape(rows, cols)
+    grid = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    grid[1:-1, 1:-1] = raw == ord('@')
+    return grid
+
+def neighbor_counts(grid):
+    """Number of rolls among the 8 neighbors of every interior cell."""
+    counts = np.zeros((grid.shape[0] - 2, grid.shape[1] - 2), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                counts += grid[dr:dr + counts.shape[0], dc:dc + counts.shape[1]]
+    return counts
+
+def accessible_numpy(grid):
+    """Mask (over the interior) of the rolls with fewer than 4 neighboring rolls."""
+    return (grid[1:-1, 1:-1] == 1) & (neighbor_counts(grid) < 4)
+
+def removal_rounds_numpy(grid):
+    """Per-round removal counts, removing every accessible roll each round."""
+    grid = grid.copy()
+    interior = grid[1:-1, 1:-1]
+    rounds = []
+    while True:
+        remove = accessible_numpy(grid)
+        removed = int(np.count_nonzero(remove))
+        if not removed:
+            break
+        rounds.append(removed)
+        interior[remove] = 0
+    instrument.count("day04.numpy_rounds", len(rounds))
+    return rounds
+
+
+@parse_cache
+def parse_bitset(path):
+    """
+    The grid as one int per row, with bit c set when column c holds a roll.
+    One bit per cell, so a row of W cells takes about W / 8 bytes.
+    """
+    return tuple(int(line.replace('@', '1').replace('.', '0') or '0', 2)
+                 for line in parse(path))
+
+def accessible_bits(above, row, below):
+    """
+    Bits of `row` whose cells have fewer than 4 neighboring rolls.
+
+    The 8 shifted neighbor rows are summed with a bit-sliced adder: b0..b3
+    hold the bits of every cell's count, so each operation counts a whole row
+    at once. A count of 4 or more is exactly b2 | b3.
+    """
+    b0 = b1 = b2 = b3 = 0
+    for x in (above << 1, above, above >> 1, row << 1, row >> 1, below << 1, below, below >> 1):
+        carry, b0 = b0 & x, b0 ^ x
+        carry, b1 = b1 & carry, b1 ^ carry
+        carry, b2 = b2 & carry, b2 ^ carry
+        b3 |= carry
+    return row & ~(b2 | b3)
+
+def removal_rounds_bitset(rows):
+    """
+    Per-round removal counts on bitset rows. After the first round only the
+    rows next to a removal can change, so only those are recomputed.
+    """
+    rows = list(rows)
+    n = len(rows)
+    rounds = []
+    dirty = range(n)
+    while True:
+        removals = {}
+        for r in dirty:
+            accessible = accessible_bits(rows[r - 1] if r > 0 else 0, rows[r],
+                                         rows[r + 1] if r + 1 < n else 0)
+            if accessible:
+                removals[r] = accessible
+        if not removals:
+            break
+        rounds.append(sum(bits.bit_count() for bits in removals.values()))
+        for r, bits in removals.items():
+            rows[r] &= ~bits
+        dirty = sorted({r + d for r in removals for d in (-1, 0, 1) if 0 <= r + d < n})
+    instrument.count("day04.bitset_rounds", len(rounds))
+    return rounds
+
+
+def part1(filename, engine='python'):
+    f = Path(__file__).resolve().parent.parent / filename
+    if engine == 'numpy':
+        grid = parse_array(f)
+        return None if grid is None else int(np.count_nonzero(accessible_numpy(grid)))
+    if engine == 'bitset':
+        rows = parse_bitset(f)
+        if not rows:
+            return
+        return sum(accessible_bits(rows[r - 1] if r > 0 else 0, row,
+                                   rows[r + 1] if r + 1 < len(rows) else 0).bit_count()
+                   for r, row in enumerate(rows))
+
+    grid = parse(f)
+
+    if not grid:
+        return # Or raise an error, depending on desired behavior for empty files
 
     rows = len(grid)
-    cols = max_cols
+    cols = len(grid[0])
 
     accessible_rolls = 0
     
@@ -47,31 +177,66 @@ def part1(filename):
                 if adjacent_rolls_count < 4:
                     accessible_rolls += 1
     
-    print(accessible_rolls)
+    return accessible_rolls
 
 
-def part2(filename):
-    f = Path(__file__).resolve().parent.parent / filename
-    with open(f, 'r') as f:
-        # Read lines and strip trailing newlines
-        grid_lines = [line.rstrip('\n') for line in f]
+def peel_rounds(grid_lines):
+    """
+    Removes accessible rolls (fewer than 4 neighboring rolls) round by round
+    until none are left, and returns how many were removed in each round.
 
-    # 1. Normalize the Grid: Find the maximum width
-    if not grid_lines:
-        return
-    
-    max_cols = max(len(line) for line in grid_lines)
-    
-    grid = []
-    for line in grid_lines:
-        row = list(line)
-        # 2. Pad shorter rows with '.' so the grid is a perfect rectangle
-        while len(row) < max_cols:
-            row.append('.')
-        grid.append(row)
+    Neighbor counts are computed once. Removing a roll only decrements its 8
+    neighbors, and the next round is exactly the neighbors that dropped below 4,
+    so the total work is O(cells) however long the cascade runs.
+    """
+    rows = len(grid_lines)
+    cols = len(grid_lines[0])
+
+    # Flatten with a one-cell border of '.' so neighbors need no bounds checks.
+    width = cols + 2
+    present = bytearray(width * (rows + 2))
+    for r, line in enumerate(grid_lines):
+        base = (r + 1) * width + 1
+        for c, ch in enumerate(line):
+            if ch == '@':
+                present[base + c] = 1
+
+    offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+    rolls = [i for i, p in enumerate(present) if p]
+    counts = [0] * len(present)
+    for i in rolls:
+        counts[i] = sum(present[i + d] for d in offsets)
+
+    rounds = []
+    updates = 0
+    current = [i for i in rolls if counts[i] < 4]
+    while current:
+        rounds.append(len(current))
+        for i in current:
+            present[i] = 0
+        following = []
+        for i in current:
+            for d in offsets:
+                j = i + d
+                if present[j]:
+                    updates += 1
+                    counts[j] -= 1
+                    # Queue a roll only on the step that takes it below 4.
+                    if counts[j] == 3:
+                        following.append(j)
+        current = following
+
+    instrument.count("day04.peel_rounds", len(rounds))
+    instrument.count("day04.peel_updates", updates)
+    return rounds
+
+
+def sweep_removals(grid_lines):
+    # Work on a mutable copy; the parsed grid is shared with part1.
+    grid = [list(line) for line in grid_lines]
 
     rows = len(grid)
-    cols = max_cols
+    cols = len(grid[0])
     
     total_removed = 0
     
@@ -81,7 +246,9 @@ def part2(filename):
         (1, -1), (1, 0), (1, 1)
     ]
 
+    sweeps = 0
     while True:
+        sweeps += 1
         rolls_to_remove = []
         
         for r in range(rows):
@@ -107,11 +274,31 @@ def part2(filename):
         for r, c in rolls_to_remove:
             grid[r][c] = '.' 
             
-    print(total_removed)
+    instrument.count("day04.sweep_iterations", sweeps)
+    return total_removed
+
+
+def part2(filename, engine='python'):
+    f = Path(__file__).resolve().parent.parent / filename
+    if engine == 'numpy':
+        grid = parse_array(f)
+        return None if grid is None else sum(removal_rounds_numpy(grid))
+    if engine == 'bitset':
+        rows = parse_bitset(f)
+        return sum(removal_rounds_bitset(rows)) if rows else None
+
+    grid_lines = parse(f)
+
+    if not grid_lines:
+        return
+
+    if engine == 'sweep':
+        return sweep_removals(grid_lines)
+    return sum(peel_rounds(grid_lines))
 
 
 if __name__ == "__main__":
-    part1("example")
-    part1("input")
-    part2("example")
-    part2("input")
+    print(part1("example"))
+    print(part1("input"))
+    print(part2("example"))
+    print(part2("input"))
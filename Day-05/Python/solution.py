@@ -1,40 +1,56 @@
 from pathlib import Path
-import bisect
+import numbers
+import sys
 
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
 
-def part1(filename):
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+from aoc.intervals import IntervalSet, MutableIntervalSet
+
+ENGINES = {1: ('python', 'numpy', 'streaming'), 2: ('python', 'streaming')}
+
+# Bytes of ID lines classified per batch by the streaming engine.
+CHUNK_SIZE = 1 << 20
+
+
+@parse_cache
+def parse(path):
     """
-    Parses an inventory database, determines which ingredients are fresh,
-    and prints the total count of fresh ingredients.
+    Parses an inventory database into the set of fresh ingredient IDs
+    and the list of available ingredient IDs.
 
     The database consists of fresh ingredient ID ranges and a list of
     available ingredient IDs, separated by a blank line.
 
     Args:
-        filename (str): The path to the input database file.
+        path (Path): The path to the input database file.
+
+    Returns:
+        tuple: (fresh, ids) where fresh is an IntervalSet of the fresh
+        ID ranges and ids is a list of ints.
     """
-    
-    # 1. Parse Input
     ranges_str = []
     ids_str = []
     is_range_section = True
-    
-    f = Path(__file__).resolve().parent.parent / filename
-    try:
-        with open(f, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    is_range_section = False
-                    continue
-                
-                if is_range_section:
-                    ranges_str.append(line)
-                else:
-                    ids_str.append(line)
-    except FileNotFoundError:
-        print(f"Error: File not found at '{filename}'")
-        return
+
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                is_range_section = False
+                continue
+
+            if is_range_section:
+                ranges_str.append(line)
+            else:
+                ids_str.append(line)
 
     ranges = []
     for r_str in ranges_str:
@@ -43,7 +59,7 @@ def part1(filename):
             ranges.append((start, end))
         except ValueError:
             continue
-            
+
     ids = []
     for id_str in ids_str:
         try:
@@ -51,91 +67,163 @@ def part1(filename):
         except ValueError:
             continue
 
-    # 2. Merge Ranges
-    merged = []
-    if ranges:
-        ranges.sort()
-        merged = [ranges[0]]
-        for i in range(1, len(ranges)):
-            current_start, current_end = ranges[i]
-            last_start, last_end = merged[-1]
-            if current_start <= last_end:
-                merged[-1] = (last_start, max(last_end, current_end))
-            else:
-                merged.append((current_start, current_end))
+    return IntervalSet(ranges), ids
 
-    # 3. Count Fresh Ingredients
+
+def read_fresh(file):
+    """
+    Reads the fresh ingredient ID ranges from an open database file,
+    stopping at the blank line that ends the range section.
+
+    Args:
+        file: A text file object positioned at the start of the database.
+
+    Returns:
+        IntervalSet: The fresh ingredient IDs.
+    """
+    ranges = []
+    for line in file:
+        line = line.strip()
+        if not line:
+            break
+        try:
+            start, end = map(int, line.split('-'))
+            ranges.append((start, end))
+        except ValueError:
+            continue
+    return IntervalSet(ranges)
+
+
+def count_fresh_streaming(path, chunk_size=CHUNK_SIZE):
+    """
+    Counts the fresh available ingredients without holding the ID list
+    in memory: the ID section is read and classified in batches of about
+    chunk_size bytes, so memory is O(ranges + chunk_size).
+
+    Args:
+        path (Path): The path to the input database file.
+        chunk_size (int): Approximate number of bytes per batch of IDs.
+
+    Returns:
+        int: The number of fresh available ingredients.
+    """
     fresh_count = 0
-    if merged:
-        start_points = [r[0] for r in merged]
-        for an_id in ids:
-            pos = bisect.bisect_right(start_points, an_id)
-            if pos > 0:
-                check_range = merged[pos - 1]
-                if check_range[0] <= an_id <= check_range[1]:
-                    fresh_count += 1
-                    
-    # 4. Print Solution
-    print(fresh_count)
-
-
-def part2(filename):
+    with open(path, 'r') as f:
+        fresh = read_fresh(f)
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            ids = []
+            for line in lines:
+                try:
+                    ids.append(int(line))
+                except ValueError:
+                    continue
+            fresh_count += sum(fresh.contains_many(ids))
+    return fresh_count
+
+
+class FreshDatabase(MutableIntervalSet):
     """
-    Parses fresh ingredient ID ranges, merges them, and counts the
-    total number of unique fresh ingredient IDs.
+    The fresh ingredient ID ranges as a database that can change over
+    time: ranges can be added and removed, and the total number of fresh
+    IDs (the part 2 answer) is kept up to date after every update instead
+    of being recomputed from a sort and merge.
+    """
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Builds the database from the range section of an inventory file.
+
+        Args:
+            path (Path): The path to the input database file.
+
+        Returns:
+            FreshDatabase: The fresh ingredient ID ranges.
+        """
+        with open(path, 'r') as f:
+            return cls(read_fresh(f))
+
+    @property
+    def fresh_count(self):
+        return self.count_covered()
+
+    def is_fresh(self, ids):
+        """
+        Checks whether an ingredient ID, or each of a batch of IDs, is fresh.
+
+        Args:
+            ids (int or list): One ingredient ID, or a list (or NumPy array)
+                of them.
+
+        Returns:
+            bool, or a list of bools (bool array) in the order given.
+        """
+        if isinstance(ids, numbers.Integral):
+            return self.contains(ids)
+        return self.contains_many(ids)
+
+
+def part1(filename, engine='python'):
+    """
+    Determines which available ingredients are fresh and returns the
+    total count of fresh ingredients.
 
     Args:
         filename (str): The path to the input database file.
-    """
-    ranges_str = []
+        engine (str): 'python' sweeps the sorted IDs against the ranges;
+            'numpy' classifies them all at once with np.searchsorted;
+            'streaming' reads and classifies the IDs in chunks.
 
+    Returns:
+        int: The number of fresh available ingredients.
+    """
     f = Path(__file__).resolve().parent.parent / filename
     try:
-        with open(f, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    # Stop reading at the blank line separator
-                    break
-                ranges_str.append(line)
+        if engine == 'streaming':
+            return count_fresh_streaming(f)
+        fresh, ids = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
 
-    ranges = []
-    for r_str in ranges_str:
-        try:
-            start, end = map(int, r_str.split('-'))
-            ranges.append((start, end))
-        except ValueError:
-            continue
+    if engine == 'numpy':
+        if np is None:
+            raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+        return int(np.count_nonzero(fresh.contains_many(np.array(ids, dtype=np.int64))))
+    return sum(fresh.contains_many(ids))
 
-    if not ranges:
-        print(0)
-        return
 
-    # Merge Overlapping Ranges (same logic as part1)
-    ranges.sort()
-    merged = [ranges[0]]
-    for i in range(1, len(ranges)):
-        current_start, current_end = ranges[i]
-        last_start, last_end = merged[-1]
-        if current_start <= last_end:
-            merged[-1] = (last_start, max(last_end, current_end))
-        else:
-            merged.append((current_start, current_end))
+def part2(filename, engine='python'):
+    """
+    Counts the total number of unique fresh ingredient IDs covered by
+    the merged fresh ingredient ID ranges.
+
+    Args:
+        filename (str): The path to the input database file.
+        engine (str): 'python' counts the merged ranges of the shared
+            parse; 'streaming' reads only the range section of the file.
 
-    # Calculate Total Fresh IDs from Merged Ranges
-    total_fresh_count = 0
-    for start, end in merged:
-        total_fresh_count += (end - start + 1)
+    Returns:
+        int: The number of fresh ingredient IDs.
+    """
+    f = Path(__file__).resolve().parent.parent / filename
+    try:
+        if engine == 'streaming':
+            with open(f, 'r') as file:
+                return read_fresh(file).count_covered()
+        fresh, _ = parse(f)
+    except FileNotFoundError:
+        print(f"Error: File not found at '{filename}'")
+        return
 
-    print(total_fresh_count)
+    return fresh.count_covered()
 
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
-
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
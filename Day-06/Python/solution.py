@@ -1,178 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import functools
 import math
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+from aoc.days import call_in_module
+
+# Engines for part2: 'python' decodes each block's columns digit by digit,
+# 'numpy' decodes every column of the worksheet at once.
+ENGINES = ('python', 'numpy')
+
+# Below this many factors math.prod is faster than building a product tree.
+PRODUCT_TREE_CUTOFF = 16
+
+def product_tree(numbers):
+    """
+    Multiplies the numbers pairwise in a balanced binary tree. Multiplying
+    left to right grows one huge partial product by a small factor at every
+    step; the tree keeps the operands of each multiplication about the same
+    size, which is much faster once products reach thousands of digits.
+    """
+    numbers = list(numbers)
+    if len(numbers) <= PRODUCT_TREE_CUTOFF:
+        return math.prod(numbers)
+    while len(numbers) > 1:
+        paired = [a * b for a, b in zip(numbers[0::2], numbers[1::2])]
+        if len(numbers) % 2:
+            paired.append(numbers[-1])
+        numbers = paired
+    return numbers[0]
 
 def solve_problem(numbers, operator):
     if operator == '+':
         return sum(numbers)
     elif operator == '*':
-        return math.prod(numbers)
+        return product_tree(numbers)
     else:
         raise ValueError(f"Unknown operator: {operator}")
 
-def part1(filename):
+def evaluate_problems(problems):
+    return sum(solve_problem(numbers, operator) for operator, numbers in problems)
+
+def grand_total(problems, workers=1):
+    """
+    Sums the results of (operator, numbers) problems, skipping problems
+    without numbers. With workers > 1 the problems are dealt round-robin to a
+    process pool, so the large products are spread out, and the partial
+    totals are added up at the end.
+    """
+    problems = [(operator, numbers) for operator, numbers in problems if numbers]
+    if workers > 1 and len(problems) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # By path, so that spawned workers can import the function.
+            worker = functools.partial(call_in_module, __file__, 'evaluate_problems')
+            return sum(pool.map(worker, [problems[i::workers] for i in range(workers)]))
+    return evaluate_problems(problems)
+
+# Translation table mapping a space to '0' and every other byte to '1'.
+NON_SPACE = bytes(ord('0') if i == ord(' ') else ord('1') for i in range(256))
+
+@parse_cache
+def parse(path):
+    """
+    Scans the worksheet for its problem blocks in a single pass.
+
+    Returns (lines, spans): the worksheet lines as bytes (trailing whitespace
+    stripped, no padding) and the (start, end) column span of every block.
+    A block is a maximal run of columns that are not blank on every line.
+    """
+    with open(path, 'rb') as file:
+        lines = [line.rstrip() for line in file]
+
+    # One bit per column, set where any line has a non-space character there:
+    # each line becomes a binary number via translate, and the rows are ORed.
+    width = max(len(line) for line in lines)
+    occupied = 0
+    for line in lines:
+        if line:
+            occupied |= int(line.translate(NON_SPACE), 2) << (width - len(line))
+
+    columns = f'{occupied:0{width}b}'
+    return lines, [m.span() for m in re.finditer('1+', columns)]
+
+def blocks(path):
+    """
+    Yields one (operator_char, number_lines) tuple per problem block, where
+    number_lines holds the block's slice of every line above the operator
+    line, as bytes. Slices of short lines are short rather than padded.
+    """
+    lines, spans = parse(path)
+    *number_lines, operator_line = lines
+    for start, end in spans:
+        yield operator_line[start:end].strip().decode(), [line[start:end] for line in number_lines]
+
+def part1(filename, workers=1):
     f = Path(__file__).resolve().parent.parent / filename
-    
-    with open(f, 'r') as file:
-        # Read lines, stripping trailing whitespace to handle input like "123 "
-        # but keep leading whitespace for alignment purposes during parsing
-        lines = [line.rstrip() for line in file] 
-
-    # Determine maximum line length for consistent padding
-    max_len = max(len(line) for line in lines)
-
-    # Pad all lines to the maximum length to ensure uniform grid for column processing
-    padded_lines = [line.ljust(max_len) for line in lines]
-
-    # Identify indices of columns that are entirely composed of spaces across all lines.
-    # These act as visual separators between problems.
-    separator_indices = []
-    for j in range(max_len):
-        is_separator_col = True
-        for i in range(len(padded_lines)):
-            if padded_lines[i][j] != ' ':
-                is_separator_col = False
-                break
-        if is_separator_col:
-            separator_indices.append(j)
-
-    # Use identified separator indices to define the horizontal start and end columns for each problem block.
-    problem_ranges = []
-    start_col = 0
-    for sep_idx in separator_indices:
-        if sep_idx > start_col:
-            problem_ranges.append((start_col, sep_idx))
-        start_col = sep_idx + 1
-    
-    # Capture the last problem block if it extends to the end of the input grid.
-    if start_col < max_len:
-        problem_ranges.append((start_col, max_len))
-    
-    grand_total = 0
-
-    # Process each identified problem block
-    for start, end in problem_ranges:
-        # Extract the relevant character slice for the current problem block from each line
-        problem_block_lines = [line[start:end] for line in padded_lines]
-        
-        # The last line of each problem block contains the operator symbol.
-        operator_char = problem_block_lines[-1].strip()
-        
-        # The lines above the operator contain the numbers for the problem.
-        numbers_str_lines = problem_block_lines[:-1]
-        
-        numbers = []
-        for s in numbers_str_lines:
-            stripped_s = s.strip()
-            if stripped_s: # Convert to int only if the stripped string is not empty
-                numbers.append(int(stripped_s))
-        
-        if not numbers: # Skip problem blocks that somehow ended up without numbers (e.g., just a separator or malformed input)
-            continue
-
-        problem_result = solve_problem(numbers, operator_char)
-        grand_total += problem_result
-    
-    print(grand_total)
-
-def part2(filename):
+    problems = ((operator_char, [int(s) for s in number_lines if s.strip()])
+                for operator_char, number_lines in blocks(f))
+    return grand_total(problems, workers)
+
+def vertical_numbers(number_lines):
+    """
+    Decodes a block's numbers read top to bottom, one per column, by digit
+    accumulation over the bytes of each line (no per-column strings).
+    Columns without digits are skipped.
+    """
+    width = max((len(line) for line in number_lines), default=0)
+    numbers = [0] * width
+    has_digit = [False] * width
+    for line in number_lines:
+        for i, c in enumerate(line):
+            if c != 32: # space
+                numbers[i] = numbers[i] * 10 + c - 48
+                has_digit[i] = True
+    return [n for n, digit in zip(numbers, has_digit) if digit]
+
+def part2_numpy(path, workers=1):
+    """
+    Part 2 for the whole worksheet at once: every column's number is decoded
+    with one vectorized multiply-add per row, + blocks are summed with a
+    single reduceat, and only * blocks drop back to Python for their product.
+    """
+    if np is None:
+        raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+    lines, spans = parse(path)
+    *number_lines, operator_line = lines
+    if not spans:
+        return 0
+    width = spans[-1][1]
+    starts = np.array([start for start, _ in spans])
+
+    # Column numbers have one digit per row, so a reduceat segment (a block
+    # plus the separator after it) sums to at most (10**rows - 1) * its
+    # width; fall back to Python ints if that could overflow int64.
+    widest = int(np.diff(starts, append=width).max())
+    dtype = np.int64 if (10 ** len(number_lines) - 1) * widest < 2 ** 63 else object
+    numbers = np.zeros(width, dtype=dtype)
+    has_digit = np.zeros(width, dtype=bool)
+    for line in number_lines:
+        row = np.full(width, ord(' '), dtype=np.uint8)
+        line = line[:width]
+        row[:len(line)] = np.frombuffer(line, dtype=np.uint8)
+        digit = row != ord(' ')
+        numbers = np.where(digit, numbers * 10 + (row.astype(dtype) - ord('0')), numbers)
+        has_digit |= digit
+
+    operators = [operator_line[start:end].strip().decode() for start, end in spans]
+    # Separator columns decode to 0, so each segment's sum is its block's sum.
+    sums = np.add.reduceat(numbers, starts).tolist()
+
+    additions = 0
+    products = []
+    for (start, end), operator, block_sum in zip(spans, operators, sums):
+        if operator == '+':
+            additions += block_sum
+        else:
+            products.append((operator, numbers[start:end][has_digit[start:end]].tolist()))
+    return additions + grand_total(products, workers)
+
+def part2(filename, engine='python', workers=1):
     f = Path(__file__).resolve().parent.parent / filename
-    
-    with open(f, 'r') as file:
-        # Read lines, stripping trailing whitespace to handle input like "123 "
-        # but keep leading whitespace for alignment purposes during parsing
-        lines = [line.rstrip() for line in file] 
-
-    # Determine maximum line length for consistent padding
-    max_len = max(len(line) for line in lines)
-
-    # Pad all lines to the maximum length to ensure uniform grid for column processing
-    padded_lines = [line.ljust(max_len) for line in lines]
-
-    # Identify indices of columns that are entirely composed of spaces across all lines.
-    # These act as visual separators between problems.
-    separator_indices = []
-    for j in range(max_len):
-        is_separator_col = True
-        for i in range(len(padded_lines)):
-            if padded_lines[i][j] != ' ':
-                is_separator_col = False
-                break
-        if is_separator_col:
-            separator_indices.append(j)
-
-    # Use identified separator indices to define the horizontal start and end columns for each problem block.
-    problem_ranges = []
-    start_col = 0
-    for sep_idx in separator_indices:
-        if sep_idx > start_col:
-            problem_ranges.append((start_col, sep_idx))
-        start_col = sep_idx + 1
-    
-    # Capture the last problem block if it extends to the end of the input grid.
-    if start_col < max_len:
-        problem_ranges.append((start_col, max_len))
-    
-    grand_total = 0
-
-    # Process each identified problem block in reverse order
-    for start, end in reversed(problem_ranges):
-        # Extract the relevant character slice for the current problem block from each line
-        problem_block_lines = [line[start:end] for line in padded_lines]
-        
-        # The last line of each problem block contains the operator symbol.
-        operator_char = problem_block_lines[-1].strip()
-        
-        # The lines above the operator contain the numbers for the problem.
-        numbers_str_lines = problem_block_lines[:-1]
-        
-        # Filter out empty lines, then find the max length for internal padding
-        filtered_numbers_str_lines = [s.strip() for s in numbers_str_lines if s.strip()]
-        if not filtered_numbers_str_lines:
-            continue
-
-        # Determine the maximum length of numbers within this specific problem block
-        # This handles cases where numbers might have different lengths within the same block
-        max_internal_len = 0
-        for line in numbers_str_lines:
-            # We need to consider the actual content length, not just the stripped length
-            # to preserve alignment for vertical reading.
-            # Find the last non-space character in the segment to determine its effective length
-            trimmed_line = line.rstrip()
-            if trimmed_line:
-                max_internal_len = max(max_internal_len, len(trimmed_line))
-        
-        # If no numbers found or max_internal_len is 0, skip
-        if max_internal_len == 0:
-            continue
-
-        # Pad numbers_str_lines to max_internal_len on the left for correct transposition.
-        # This ensures that digits align correctly when read vertically.
-        padded_internal_numbers = [line.rjust(max_internal_len) for line in numbers_str_lines]
-        
-        # Transpose the numbers_str_lines to read numbers vertically
-        transposed_numbers = []
-        for i in range(max_internal_len): # Iterate over columns
-            current_number_str = ""
-            for j in range(len(padded_internal_numbers)): # Iterate over rows
-                char = padded_internal_numbers[j][i]
-                if char.isdigit():
-                    current_number_str += char
-            if current_number_str:
-                transposed_numbers.append(int(current_number_str))
-        
-        if not transposed_numbers: # Skip if no numbers were formed after transposition
-            continue
-
-        problem_result = solve_problem(transposed_numbers, operator_char)
-        grand_total += problem_result
-    
-    print(grand_total)
+
+    if engine == 'numpy':
+        return part2_numpy(f, workers)
+
+    problems = ((operator_char, vertical_numbers(number_lines))
+                for operator_char, number_lines in blocks(f))
+    return grand_total(problems, workers)
 
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
 
 
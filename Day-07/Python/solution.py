@@ -1,22 +1,166 @@
 from pathlib import Path
 from collections import defaultdict
+import sys
 
-def part1(filename):
-    f = Path(__file__).resolve().parent.parent / filename
-    
+try:
+    import numpy as np
+except ImportError:  # only needed for engine='numpy'
+    np = None
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+
+# 'bitset' is a part1 engine; 'numpy' and 'table' (a Manifold) are part2
+# engines.
+ENGINES = {1: ('python', 'bitset'), 2: ('python', 'numpy', 'table')}
+
+SPLITTERS = bytes.maketrans(b'^.S', b'100')
+EMPTY = bytes.maketrans(b'^.S', b'010')
+
+@parse_cache
+def parse(path):
     grid = []
+    start_row = -1
     start_col = -1
+
+    with open(path, 'r') as file:
+        for r_idx, line in enumerate(file):
+            line = line.strip()
+            if not line:
+                continue
+            grid.append(line)
+            if 'S' in line:
+                start_row = r_idx
+                start_col = line.find('S')
+
+    return grid, start_row, start_col
+
+@parse_cache
+def row_masks(path):
+    """
+    Every grid row as a pair of bitmasks (splitters, empty cells), one bit
+    per column. Both masks use the same bit order, so column c's neighbors
+    are one shift away in either direction.
+    """
+    grid, _, _ = parse(path)
+    return [(int(line.encode().translate(SPLITTERS), 2), int(line.encode().translate(EMPTY), 2))
+            for line in grid]
+
+def count_splits_bitset(masks, width, start_row, start_col):
+    """
+    Runs the beams down the grid a whole row at a time: beams on empty cells
+    carry on, beams on splitters move one column each way (shifts clipped to
+    the grid width), and each row's splits are a popcount.
+    """
+    full = (1 << width) - 1
+    beams = 1 << (width - 1 - start_col)
+    split_count = 0
+    for split, empty in masks[start_row + 1:]:
+        if not beams:
+            break
+        hit = beams & split
+        split_count += hit.bit_count()
+        beams = (beams & empty) | ((hit << 1) & full) | (hit >> 1)
+    return split_count
+
+@parse_cache
+def parse_array(path):
+    """The grid as a (rows, cols) uint8 array of its characters."""
+    if np is None:
+        raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+    grid, _, _ = parse(path)
+    return np.frombuffer(''.join(grid).encode(), dtype=np.uint8).reshape(len(grid), -1)
+
+def count_timelines_numpy(cells, start_row, start_col):
+    """
+    Propagates the number of timelines in every column a whole row at a time:
+    counts on '.'/'S' stay, counts on '^' move one column left and right, and
+    counts pushed off either side are finished timelines. Counts are int64
+    until they could overflow, then Python ints (object dtype) so the answer
+    stays exact.
+
+    Timelines spread at most one column per row, so each row only touches
+    the window of columns they can have reached.
+    """
+    rows, cols = cells.shape
+    splits = cells == ord('^')
+    passes = (cells == ord('.')) | (cells == ord('S'))
+    counts = np.zeros(cols, dtype=np.int64)
+    counts[start_col] = 1
+    lo, hi = start_col, start_col + 1
+    finished = 0
+    # A column receives at most three counts per row, so below this limit
+    # the next row cannot overflow int64.
+    limit = np.iinfo(np.int64).max // 3
+    for r in range(start_row, rows):
+        window = counts[lo:hi]
+        if counts.dtype != object and window.max() > limit:
+            counts = counts.astype(object)
+            window = counts[lo:hi]
+        split = window * splits[r, lo:hi]
+        window *= passes[r, lo:hi]
+        window[:-1] += split[1:]
+        window[1:] += split[:-1]
+        # Splits at the window edges move out of it: into the next column,
+        # or off the grid.
+        if lo > 0:
+            counts[lo - 1] += split[0]
+        else:
+            finished += int(split[0])
+        if hi < cols:
+            counts[hi] += split[-1]
+        else:
+            finished += int(split[-1])
+        lo, hi = max(lo - 1, 0), min(hi + 1, cols)
+    return finished + sum(counts.tolist())
+
+class Manifold:
+    """
+    Timeline counts for a particle started in any column of the start row
+    (as if 'S' were there), for running many different starts against the
+    same grid.
+
+    A single backward pass over the rows gives every column's count at once:
+    below the last row, or off either side, a particle is one finished
+    timeline; a '.' or 'S' passes the count of the cell below it up, a '^'
+    adds the counts below its left and right neighbors, and anything else
+    stops the particle. So N queries cost O(rows x cols) in total.
+    """
+
+    def __init__(self, grid, start_row):
+        cols = len(grid[0])
+        below = [1] * cols
+        # The start cell passes the particle down, so the answer for a start
+        # column is the count just below it.
+        for line in reversed(grid[start_row + 1:]):
+            # Pad with a finished timeline on either side.
+            padded = [1, *below, 1]
+            below = [padded[c + 1] if ch == '.' or ch == 'S'
+                     else padded[c] + padded[c + 2] if ch == '^'
+                     else 0
+                     for c, ch in enumerate(line)]
+        self.start_row = start_row
+        self.counts = below
+
+    @classmethod
+    def from_file(cls, path):
+        grid, start_row, _ = parse(path)
+        return cls(grid, start_row)
+
+    def timelines_from(self, col):
+        """Number of timelines for a particle started at column col."""
+        if not 0 <= col < len(self.counts):
+            raise ValueError(f"Column {col} is outside the grid")
+        return self.counts[col]
+
+def part1(filename, engine='python'):
+    f = Path(__file__).resolve().parent.parent / filename
     
     try:
-        with open(f, 'r') as file:
-            for r_idx, line in enumerate(file):
-                line = line.strip()
-                if not line:
-                    continue
-                grid.append(list(line))
-                if 'S' in line:
-                    start_row = r_idx
-                    start_col_s = line.find('S')
+        grid, start_row, start_col_s = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -28,6 +172,9 @@ def part1(filename):
     rows = len(grid)
     cols = len(grid[0])
 
+    if engine == 'bitset':
+        return count_splits_bitset(row_masks(f), cols, start_row, start_col_s)
+
     split_count = 0
     
     # Active beams are represented by their column indices
@@ -61,25 +208,13 @@ def part1(filename):
         
         active_beams = next_active_beams
             
-    print(split_count)
+    return split_count
 
-def part2(filename):
+def part2(filename, engine='python'):
     f = Path(__file__).resolve().parent.parent / filename
     
-    grid = []
-    start_row = -1
-    start_col = -1
-    
     try:
-        with open(f, 'r') as file:
-            for r_idx, line in enumerate(file):
-                line = line.strip()
-                if not line:
-                    continue
-                grid.append(list(line))
-                if 'S' in line:
-                    start_row = r_idx
-                    start_col = line.find('S')
+        grid, start_row, start_col = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -90,6 +225,11 @@ def part2(filename):
 
     rows = len(grid)
     cols = len(grid[0])
+
+    if engine == 'numpy':
+        return count_timelines_numpy(parse_array(f), start_row, start_col)
+    if engine == 'table':
+        return Manifold(grid, start_row).timelines_from(start_col)
     
     total_completed_timelines = 0
     # timelines: dict mapping column index to number of timelines at that position for the current row
@@ -120,10 +260,10 @@ def part2(filename):
     # Any timelines remaining in the `timelines` dict have exited the bottom of the grid.
     total_completed_timelines += sum(timelines.values())
     
-    print(total_completed_timelines)
+    return total_completed_timelines
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
\ No newline at end of file
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
\ No newline at end of file
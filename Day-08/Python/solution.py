@@ -1,7 +1,24 @@
 from pathlib import Path
+import heapq
+import itertools
 import math
+import sys
 from collections import defaultdict
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc import instrument
+from aoc.cache import parse_cache
+
+# 'grid' generates edges nearest first from a uniform grid of cells;
+# 'pairs' sorts every pairwise distance up front.
+ENGINES = ('grid', 'pairs')
+
+# Average number of junction boxes per grid cell.
+POINTS_PER_CELL = 2
+
 class DSU:
     def __init__(self, n):
         self.parent = list(range(n))
@@ -28,17 +45,110 @@ class DSU:
 def calculate_distance(p1, p2):
     return math.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2 + (p2[2] - p1[2])**2)
 
-def part1(filename):
+@parse_cache
+def parse(path):
+    coordinates = []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                x, y, z = map(int, line.split(','))
+                coordinates.append((x, y, z))
+    return coordinates
+
+@parse_cache
+def sorted_distances(path):
+    """All pairwise (dist, i, j) tuples, sorted by distance. Shared by both parts."""
+    coordinates = parse(path)
+    num_junction_boxes = len(coordinates)
+
+    # 1. Calculate all pairwise distances
+    distances = []
+    for i in range(num_junction_boxes):
+        for j in range(i + 1, num_junction_boxes):
+            dist = calculate_distance(coordinates[i], coordinates[j])
+            distances.append((dist, i, j))
+
+    # 2. Sort pairs by distance
+    distances.sort()
+    return distances
+
+def nearest_edges(coordinates):
+    """
+    Yields every pair as (squared distance, i, j) with i < j, in increasing
+    order, the same order as sorted_distances but computed lazily and without
+    sqrt.
+
+    The boxes are bucketed into cubic cells of side `size`. Pairs are found
+    shell by shell: shell k holds the pairs whose cells are k cells apart
+    (Chebyshev distance). Boxes k + 1 or more cells apart are at least
+    k * size + 1 apart on some axis, so once shells 0..k are in the heap,
+    every edge shorter than that is final and can be yielded. Taking only
+    the first N edges therefore touches only the nearby cells.
+    """
+    n = len(coordinates)
+    if n < 2:
+        return
+    lows = [min(axis) for axis in zip(*coordinates)]
+    extents = [max(axis) - low + 1 for axis, low in zip(zip(*coordinates), lows)]
+    size = max(1, math.ceil((math.prod(extents) * POINTS_PER_CELL / n) ** (1 / 3)))
+
+    cells = defaultdict(list)
+    for i, (x, y, z) in enumerate(coordinates):
+        cells[((x - lows[0]) // size, (y - lows[1]) // size, (z - lows[2]) // size)].append(i)
+    occupied = list(cells)
+    max_shell = max(math.ceil(extent / size) for extent in extents)
+
+    def squared_distance(i, j):
+        (x1, y1, z1), (x2, y2, z2) = coordinates[i], coordinates[j]
+        return (x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2
+
+    def cell_pairs(a, b):
+        if a is b:
+            return itertools.combinations(a, 2)
+        return itertools.product(a, b)
+
+    heap = []
+    for k in range(max_shell + 1):
+        instrument.count("day08.grid_shells")
+        # Cell offsets on shell k, each cell pair once (the positive half).
+        shell = [(dx, dy, dz)
+                 for dx in range(-k, k + 1) for dy in range(-k, k + 1) for dz in range(-k, k + 1)
+                 if max(abs(dx), abs(dy), abs(dz)) == k and (dx, dy, dz) >= (0, 0, 0)]
+        if len(shell) > len(occupied):
+            # Far shells: scanning cell pairs is cheaper than scanning offsets,
+            # so push every remaining pair and drain the heap in order.
+            for c1, c2 in itertools.combinations(occupied, 2):
+                if max(abs(u - v) for u, v in zip(c1, c2)) >= k:
+                    for i, j in cell_pairs(cells[c1], cells[c2]):
+                        heap.append((squared_distance(i, j), min(i, j), max(i, j)))
+            instrument.count("day08.grid_edges", len(heap))
+            heapq.heapify(heap)
+            break
+
+        generated = 0
+        for cx, cy, cz in occupied:
+            here = cells[(cx, cy, cz)]
+            for dx, dy, dz in shell:
+                there = cells.get((cx + dx, cy + dy, cz + dz))
+                if there is None:
+                    continue
+                for i, j in cell_pairs(here, there):
+                    generated += 1
+                    heapq.heappush(heap, (squared_distance(i, j), min(i, j), max(i, j)))
+        instrument.count("day08.grid_edges", generated)
+
+        bound = (k * size + 1) ** 2
+        while heap and heap[0][0] < bound:
+            yield heapq.heappop(heap)
+    while heap:
+        yield heapq.heappop(heap)
+
+def part1(filename, engine='grid'):
     f = Path(__file__).resolve().parent.parent / filename
     
-    coordinates = []
     try:
-        with open(f, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    x, y, z = map(int, line.split(','))
-                    coordinates.append((x, y, z))
+        coordinates = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -51,15 +161,11 @@ def part1(filename):
         print("Not enough junction boxes to form circuits for multiplication.")
         return
 
-    # 1. Calculate all pairwise distances
-    distances = []
-    for i in range(num_junction_boxes):
-        for j in range(i + 1, num_junction_boxes):
-            dist = calculate_distance(coordinates[i], coordinates[j])
-            distances.append((dist, i, j))
-
-    # 2. Sort pairs by distance
-    distances.sort()
+    # 1-2. Pairs in increasing distance order
+    if engine == 'pairs':
+        distances = sorted_distances(f)
+    else:
+        distances = nearest_edges(coordinates)
 
     # 3. Connect closest pairs using DSU
     dsu = DSU(num_junction_boxes)
@@ -69,7 +175,7 @@ def part1(filename):
     if filename == 'example':
         max_attempts = 10 
 
-    for dist, i, j in distances:
+    for _, i, j in distances:
         if attempts_made >= max_attempts:
             break
         dsu.union(i, j) # Always attempt union, whether it changes the structure or not
@@ -84,27 +190,18 @@ def part1(filename):
     # 5. Multiply sizes of three largest circuits
     sorted_sizes = sorted(circuit_sizes.values(), reverse=True)
 
-    if filename == 'example':
-        print(f"Sorted circuit sizes for example: {sorted_sizes}")
-
     if len(sorted_sizes) < 3:
         print("Not enough circuits to multiply the three largest.")
         return
 
     result = sorted_sizes[0] * sorted_sizes[1] * sorted_sizes[2]
-    print(result)
+    return result
 
-def part2(filename):
+def part2(filename, engine='grid'):
     f = Path(__file__).resolve().parent.parent / filename
     
-    coordinates = []
     try:
-        with open(f, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    x, y, z = map(int, line.split(','))
-                    coordinates.append((x, y, z))
+        coordinates = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -117,22 +214,18 @@ def part2(filename):
         print("Not enough junction boxes to form a circuit.")
         return
 
-    # 1. Calculate all pairwise distances
-    distances = []
-    for i in range(num_junction_boxes):
-        for j in range(i + 1, num_junction_boxes):
-            dist = calculate_distance(coordinates[i], coordinates[j])
-            distances.append((dist, i, j))
-
-    # 2. Sort pairs by distance
-    distances.sort()
+    # 1-2. Pairs in increasing distance order
+    if engine == 'pairs':
+        distances = sorted_distances(f)
+    else:
+        distances = nearest_edges(coordinates)
 
     # 3. Connect closest pairs using DSU until all in one circuit
     dsu = DSU(num_junction_boxes)
     num_circuits = num_junction_boxes
     last_connected_coords = None
 
-    for dist, i, j in distances:
+    for _, i, j in distances:
         if num_circuits == 1: # All boxes are already in one circuit
             break
         
@@ -150,12 +243,12 @@ def part2(filename):
         x1 = last_connected_coords[0][0]
         x2 = last_connected_coords[1][0]
         result = x1 * x2
-        print(result)
+        return result
     else:
         print("Could not find the last connected pair to form a single circuit.")
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
\ No newline at end of file
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
\ No newline at end of file
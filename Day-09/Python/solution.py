@@ -1,17 +1,29 @@
 from pathlib import Path
 from collections import deque
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+
+@parse_cache
+def parse(path):
+    red_tiles = []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                x, y = map(int, line.split(','))
+                red_tiles.append((x, y))
+    return red_tiles
 
 def part1(filename):
     f = Path(__file__).resolve().parent.parent / filename
     
-    red_tiles = []
     try:
-        with open(f, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    x, y = map(int, line.split(','))
-                    red_tiles.append((x, y))
+        red_tiles = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -32,19 +44,13 @@ def part1(filename):
                 if area > max_area:
                     max_area = area
     
-    print(max_area)
+    return max_area
 
 def part2(filename):
     f = Path(__file__).resolve().parent.parent / filename
     
-    red_tiles = []
     try:
-        with open(f, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line:
-                    x, y = map(int, line.split(','))
-                    red_tiles.append((x, y))
+        red_tiles = parse(f)
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
         return
@@ -53,8 +59,7 @@ def part2(filename):
         return
 
     if not red_tiles:
-        print(0)
-        return
+        return 0
 
     # --- 1. Coordinate Compression with Margin ---
     x_coords = list(set(p[0] for p in red_tiles))
@@ -147,11 +152,11 @@ def part2(filename):
                 if area > max_area:
                     max_area = area
     
-    print(max_area)
+    return max_area
 
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
\ No newline at end of file
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
\ No newline at end of file
@@ -3,6 +3,13 @@ import re
 import math
 import collections
 from fractions import Fraction
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
 
 
 def parse_line_part1(line):
@@ -59,25 +66,29 @@ def solve_machine_part1(target_state, button_schematics, num_lights):
     
     return min_presses_for_machine
 
+@parse_cache
+def parse(path):
+    machines = []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            machines.append((line, parse_line_part1(line)))
+    return machines
+
 def part1(filename):
     f = Path(__file__).resolve().parent.parent / filename
     
     total_min_presses = 0
     try:
-        with open(f, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                target_state, button_schematics, num_lights = parse_line_part1(line)
-                
-                min_for_this_machine = solve_machine_part1(target_state, button_schematics, num_lights)
-                
-                if min_for_this_machine == float('inf'):
-                    print(f"Warning: Could not configure machine: {line}")
-                else:
-                    total_min_presses += min_for_this_machine
+        for line, (target_state, button_schematics, num_lights) in parse(f):
+            min_for_this_machine = solve_machine_part1(target_state, button_schematics, num_lights)
+
+            if min_for_this_machine == float('inf'):
+                print(f"Warning: Could not configure machine: {line}")
+            else:
+                total_min_presses += min_for_this_machine
 
     except FileNotFoundError:
         print(f"Error: File not found at '{filename}'")
@@ -86,6 +97,6 @@ def part1(filename):
         print(f"Error processing file '{filename}': {e}")
         return
 
-    print(total_min_presses)
+    return total_min_presses
 
 
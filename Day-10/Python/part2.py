@@ -5,6 +5,14 @@ import collections
 from fractions import Fraction
 import numpy as np
 from scipy.optimize import milp, LinearConstraint, Bounds
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc import instrument
+from aoc.cache import parse_cache
 
 
 def parse_line_part2(line):
@@ -55,6 +63,7 @@ def solve_machine_milp(target_joltage, button_schematics, num_counters):
     
     # 6. Solve
     res = milp(c=c, constraints=constraints, integrality=integrality, bounds=bounds)
+    instrument.count("day10.milp_solves")
     
     if res.success:
         # result.x gives the optimal button presses
@@ -64,27 +73,31 @@ def solve_machine_milp(target_joltage, button_schematics, num_counters):
         # If the status is 2 (infeasible), no solution exists
         return float('inf')
 
-def part2(filename):
-    f = Path(__file__).resolve().parent.parent / filename
-    
-    total_min_presses = 0
-    with open(f, 'r') as file:
+@parse_cache
+def parse(path):
+    machines = []
+    with open(path, 'r') as file:
         for line in file:
             line = line.strip()
             if not line:
                 continue
-            
-            target_joltage, button_schematics, num_counters = parse_line_part2(line)
-            
-            min_presses = solve_machine_milp(target_joltage, button_schematics, num_counters)
-            
-            if min_presses == float('inf'):
-                # Some machines might be unsolvable, which is valid
-                pass
-            else:
-                total_min_presses += min_presses
+            machines.append((line, parse_line_part2(line)))
+    return machines
 
-    print(total_min_presses)
+def part2(filename):
+    f = Path(__file__).resolve().parent.parent / filename
+    
+    total_min_presses = 0
+    for _, (target_joltage, button_schematics, num_counters) in parse(f):
+        min_presses = solve_machine_milp(target_joltage, button_schematics, num_counters)
+
+        if min_presses == float('inf'):
+            # Some machines might be unsolvable, which is valid
+            pass
+        else:
+            total_min_presses += min_presses
+
+    return total_min_presses
 
 
 ###############################################
@@ -119,12 +132,15 @@ def solve_machine_part2(target_joltage, button_schematics, num_counters):
     # Dictionary to store the minimum presses to reach a given joltage state
     # This acts as both visited set and distance map
     min_presses_to_state = {initial_joltage_state: 0}
+    states_visited = 0
     
     while queue:
         current_jv_tuple, current_presses = queue.popleft()
+        states_visited += 1
 
         # If we reached the target, return immediately as BFS guarantees shortest path
         if list(current_jv_tuple) == target_joltage:
+            instrument.count("day10.bfs_states_visited", states_visited)
             return current_presses
         
         # Explore pressing each button once
@@ -150,6 +166,7 @@ def solve_machine_part2(target_joltage, button_schematics, num_counters):
                     min_presses_to_state[next_jv_tuple] = next_presses
                     queue.append((next_jv_tuple, next_presses))
                     
+    instrument.count("day10.bfs_states_visited", states_visited)
     return float('inf') # Target not reachable
 
 
@@ -157,20 +174,13 @@ def part2_bruteforcedfs(filename):
     f = Path(__file__).resolve().parent.parent / filename
     
     total_min_presses = 0
-    with open(f, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
-            
-            target_joltage, button_schematics, num_counters = parse_line_part2(line)
-            
-            min_for_this_machine = solve_machine_part2(target_joltage, button_schematics, num_counters)
-            
-            if min_for_this_machine == float('inf'):
-                print(f"Warning: Could not configure machine for Part 2: {line}")
-            else:
-                total_min_presses += min_for_this_machine
+    for line, (target_joltage, button_schematics, num_counters) in parse(f):
+        min_for_this_machine = solve_machine_part2(target_joltage, button_schematics, num_counters)
+
+        if min_for_this_machine == float('inf'):
+            print(f"Warning: Could not configure machine for Part 2: {line}")
+        else:
+            total_min_presses += min_for_this_machine
 
-    print(total_min_presses)
+    return total_min_presses
 
@@ -2,7 +2,7 @@ from part1 import part1
 from part2 import part2
 
 if __name__ == "__main__":
-    part1('example')
-    part1('input')
-    part2('example')
-    part2('input')
+    print(part1('example'))
+    print(part1('input'))
+    print(part2('example'))
+    print(part2('input'))
@@ -1,6 +1,14 @@
 from pathlib import Path
 from collections import defaultdict
+import sys
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc.cache import parse_cache
+
+@parse_cache
 def parse_graph(filename):
     graph = defaultdict(list)
     try:
@@ -60,7 +68,7 @@ def part1(filename):
 
     memo = {}
     result = count_paths('you', 'out', graph, memo)
-    print(result)
+    return result
 
 # New function for part2
 def count_paths_with_targets(current_node, end_node, graph, target1, target2, visited_target1, visited_target2, memo):
@@ -103,10 +111,10 @@ def part2(filename):
     memo = {}
     # Initial call: from 'svr' to 'out', requiring 'dac' and 'fft', neither visited yet
     result = count_paths_with_targets('svr', 'out', graph, 'dac', 'fft', False, False, memo)
-    print(result)
+    return result
 
 if __name__ == "__main__":
-    part1('example_part1')
-    part1('input')
-    part2('example_part2')
-    part2('input')
+    print(part1('example_part1'))
+    print(part1('input'))
+    print(part2('example_part2'))
+    print(part2('input'))
@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 import sys
 import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from aoc import instrument
+from aoc.cache import parse_cache
 
 
 def parse_input(data):
@@ -133,9 +141,11 @@ def backtrack_solve(width, height, counts, shape_orients, shape_areas, num_shape
     full = (1 << grid_area) - 1
     remaining = list(counts)
     area_left = total_area
+    nodes = 0
 
     def backtrack(grid, empty_left):
-        nonlocal area_left
+        nonlocal area_left, nodes
+        nodes += 1
         if area_left == 0:
             return True
         if empty_left < area_left:
@@ -164,7 +174,9 @@ def backtrack_solve(width, height, counts, shape_orients, shape_areas, num_shape
 
         return False
 
-    return backtrack(0, grid_area)
+    found = backtrack(0, grid_area)
+    instrument.count("day12.backtrack_nodes", nodes)
+    return found
 
 
 def solve_region(width, height, counts, shape_orients, shape_areas, num_shapes):
@@ -176,26 +188,39 @@ def solve_region(width, height, counts, shape_orients, shape_areas, num_shapes):
         return True
 
     if greedy_solve(width, height, counts, shape_orients, num_shapes):
+        instrument.count("day12.greedy_solved")
         return True
 
+    instrument.count("day12.backtrack_regions")
     return backtrack_solve(width, height, counts, shape_orients, shape_areas, num_shapes)
 
 
-def main():
-    with open(sys.argv[1]) as f:
+@parse_cache
+def parse(path):
+    with open(path) as f:
         data = f.read()
 
     shapes, regions = parse_input(data)
-    num_shapes = len(shapes)
     shape_areas = {i: len(s) for i, s in shapes.items()}
     shape_orients = {i: list(get_orientations(s)) for i, s in shapes.items()}
+    return shapes, regions, shape_areas, shape_orients
+
+
+def part1(filename):
+    f = Path(__file__).resolve().parent.parent / filename
+    shapes, regions, shape_areas, shape_orients = parse(f)
+    num_shapes = len(shapes)
 
     result = 0
     for w, h, counts in regions:
         if solve_region(w, h, counts, shape_orients, shape_areas, num_shapes):
             result += 1
 
-    print(result)
+    return result
+
+
+def main():
+    print(part1(Path(sys.argv[1]).resolve()))
 
 
 if __name__ == '__main__':
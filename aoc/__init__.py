@@ -0,0 +1 @@
+"""Shared tooling for running and measuring the Day-NN Python solutions."""
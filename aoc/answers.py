@@ -0,0 +1,70 @@
+"""Known-good answers per (day, part, input), used as a regression store.
+
+Answers live in ``answers.json`` next to this file, nested as
+``{day: {part: {input: answer}}}`` with string keys. Inputs are the
+file names used by the runner (``example``, ``input``) or, for
+generated benchmark inputs, ``gen:scale=<scale>:seed=<seed>``; those
+entries are only valid for the generator code that produced them, so
+re-record them after changing a generator.
+"""
+import json
+from pathlib import Path
+
+ANSWERS_FILE = Path(__file__).resolve().parent / "answers.json"
+
+
+class AnswerMismatch(Exception):
+    def __init__(self, day, part, input_key, expected, actual):
+        super().__init__(
+            f"Day {day} part {part} on {input_key!r}: expected {expected}, got {actual}"
+        )
+        self.expected = expected
+        self.actual = actual
+
+
+def generated_key(scale, seed):
+    return f"gen:scale={scale}:seed={seed}"
+
+
+class AnswerStore:
+    def __init__(self, path=ANSWERS_FILE):
+        self.path = Path(path)
+        self.answers = {}
+        if self.path.is_file():
+            with open(self.path) as f:
+                self.answers = json.load(f)
+        self.dirty = False
+
+    def get(self, day, part, input_key):
+        return self.answers.get(str(day), {}).get(str(part), {}).get(input_key)
+
+    def check(self, day, part, input_key, answer):
+        """Compare an answer against the store.
+
+        Returns True if it matches a known answer and None if there is
+        no known answer; raises AnswerMismatch otherwise.
+        """
+        expected = self.get(day, part, input_key)
+        if expected is None:
+            return None
+        if str(expected) != str(answer):
+            raise AnswerMismatch(day, part, input_key, expected, answer)
+        return True
+
+    def record(self, day, part, input_key, answer):
+        if answer is None or self.get(day, part, input_key) is not None:
+            return
+        self.answers.setdefault(str(day), {}).setdefault(str(part), {})[input_key] = answer
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        ordered = {
+            day: {part: dict(sorted(inputs.items())) for part, inputs in sorted(parts.items())}
+            for day, parts in sorted(self.answers.items(), key=lambda item: int(item[0]))
+        }
+        with open(self.path, "w") as f:
+            json.dump(ordered, f, indent=2)
+            f.write("\n")
+        self.dirty = False
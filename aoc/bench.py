@@ -0,0 +1,351 @@
+"""Benchmark every day's parts over a ladder of synthetic input sizes.
+
+Usage (from the repository root):
+
+    python3 -m aoc.bench                          # all days, default ladder
+    python3 -m aoc.bench 8 9 --scales 0.1 1 10    # chosen days and sizes
+    python3 -m aoc.bench 4 --max-seconds 5 --memory
+    python3 -m aoc.bench 1 --engine numpy         # benchmark an alternative engine
+    python3 -m aoc.bench --micro day05-updates    # one registered micro-benchmark
+
+Inputs come from aoc.generators; scale 1 is about the size of a real
+puzzle input. For each (day, part) the sizes are run smallest first,
+and the ladder stops once the next run is expected to take longer
+than --max-seconds, extrapolating from the growth seen so far. Every invocation
+appends one run record to the JSON results file, so successive runs
+can be compared to spot regressions and read off complexity curves.
+
+Answers are checked against aoc/answers.json (generated inputs are
+keyed by scale and seed) and the benchmark stops at the first wrong
+answer. Pass --record to store answers that are not known yet.
+
+Micro-benchmarks time competing implementations of one piece of a
+solution against each other (e.g. an incremental data structure vs.
+rebuilding from scratch) over the same scale ladder. They are
+registered with ``@micro_benchmark(name)`` and run with --micro; every
+variant must produce the same result.
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from aoc import cache
+from aoc.answers import AnswerMismatch, AnswerStore, generated_key
+from aoc.days import PARTS, available_days, load_day
+from aoc.generators import GENERATORS, generate
+from aoc.intervals import IntervalSet
+from aoc.run import NO_ANSWER, measure, parse_days
+
+DEFAULT_SCALES = [0.1, 1, 10, 100, 1000]
+DEFAULT_OUTPUT = Path(__file__).resolve().parent.parent / "bench_results.json"
+
+MICRO_BENCHMARKS = {}
+
+
+def expected_wall(history, scale):
+    """Extrapolate the wall time at ``scale`` from earlier runs.
+
+    The growth exponent is fitted to the last two runs (never less
+    than linear); with a single run, linear growth is assumed.
+    """
+    last_scale, last_wall = history[-1]
+    exponent = 1.0
+    if len(history) > 1:
+        prev_scale, prev_wall = history[-2]
+        if prev_wall > 0 and last_wall > 0:
+            exponent = max(1.0, math.log(last_wall / prev_wall) / math.log(last_scale / prev_scale))
+    return last_wall * (scale / last_scale) ** exponent
+
+
+def bench_day(day_number, parts, scales, seed, max_seconds, trace_memory, input_dir,
+              store, record=False, engine=None, workers=1):
+    """Run one day's parts over the scale ladder, yielding result dicts.
+
+    Raises AnswerMismatch (after yielding the offending result) if an
+    answer disagrees with the store.
+    """
+    day = load_day(day_number)
+    history = {part: [] for part in parts}  # (scale, wall) of completed runs
+    stopped = set()
+    for scale in sorted(scales):
+        runnable = [p for p in parts if p in day.parts and p not in stopped]
+        if not runnable:
+            break
+        path = Path(input_dir) / f"day{day_number:02d}-scale{scale}-seed{seed}.txt"
+        path.write_text(generate(day_number, scale, seed))
+        for part in runnable:
+            kwargs = {}
+            if engine is not None and engine in day.engines.get(part, ()):
+                kwargs["engine"] = engine
+            if workers > 1 and "workers" in day.parameters.get(part, ()):
+                kwargs["workers"] = workers
+            result = {
+                "day": day_number, "part": part, "scale": scale,
+                "engine": kwargs.get("engine"),
+                "input_bytes": path.stat().st_size,
+            }
+            if history[part]:
+                if expected_wall(history[part], scale) > max_seconds:
+                    stopped.add(part)
+                    result["skipped"] = f"expected > {max_seconds}s"
+                    yield result
+                    continue
+
+            # Each measurement includes its own parse.
+            cache.clear()
+            answer, wall, cpu, peak, error = measure(
+                day.parts[part], str(path), trace_memory=trace_memory, **kwargs)
+            result.update(answer=answer, wall=wall, cpu=cpu, peak=peak, error=error)
+            if error and not error.startswith(NO_ANSWER):
+                stopped.add(part)
+                yield result
+                continue
+
+            history[part].append((scale, wall))
+            if error:
+                # Some sizes legitimately have no answer (e.g. Day-08 with
+                # fewer boxes than connections); keep climbing the ladder.
+                yield result
+                continue
+            key = generated_key(scale, seed)
+            try:
+                result["verified"] = store.check(day_number, part, key, answer)
+            except AnswerMismatch as e:
+                result["error"] = f"WRONG ANSWER: expected {e.expected}"
+                yield result
+                raise
+            if record:
+                store.record(day_number, part, key, answer)
+            yield result
+
+
+def micro_benchmark(name):
+    """Register ``fn(scale, rng)`` as a micro-benchmark.
+
+    ``fn`` does any untimed setup and returns ``{variant: callable}``;
+    each zero-argument callable is timed and must return the same
+    result as the others.
+    """
+    def register(fn):
+        MICRO_BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+@micro_benchmark("day05-updates")
+def day05_updates(scale, rng):
+    """Day-05 fresh count after each of a stream of range additions and
+    removals: the incremental database vs. a sort-and-merge rebuild."""
+    module = load_day(5).modules[1]
+    limit = 5 * 10 ** 14
+    n = max(1, round(190 * scale))
+
+    def random_range():
+        start = rng.randint(1, limit)
+        return start, start + rng.randint(0, 10 ** 12)
+
+    initial = [random_range() for _ in range(n)]
+    updates = [(rng.random() < 0.5, *random_range()) for _ in range(n)]
+
+    def incremental():
+        db = module.FreshDatabase(initial)
+        total = 0
+        for add, start, end in updates:
+            if add:
+                db.add_range(start, end)
+            else:
+                db.remove_range(start, end)
+            total += db.fresh_count
+        return total
+
+    def rebuild():
+        ranges = list(initial)
+        total = 0
+        for add, start, end in updates:
+            if add:
+                ranges.append((start, end))
+            else:
+                clipped = []
+                for s, e in ranges:
+                    if s < start:
+                        clipped.append((s, min(e, start - 1)))
+                    if e > end:
+                        clipped.append((max(s, end + 1), e))
+                ranges = clipped
+            total += IntervalSet(ranges).count_covered()
+        return total
+
+    return {"incremental": incremental, "rebuild": rebuild}
+
+
+@micro_benchmark("day06-products")
+def day06_products(scale, rng):
+    """Day-06 multiplication blocks with many tall columns (18-digit
+    numbers): math.prod left to right vs. the balanced product tree."""
+    module = load_day(6).modules[1]
+    columns = max(2, round(2000 * scale))
+    blocks = [[rng.randint(10 ** 17, 10 ** 18 - 1) for _ in range(columns)] for _ in range(4)]
+    # The products run to millions of digits; compare them by residue
+    # rather than printing and storing them.
+    modulus = 2 ** 61 - 1
+
+    def left_to_right():
+        return sum(math.prod(block) for block in blocks) % modulus
+
+    def tree():
+        return sum(module.product_tree(block) for block in blocks) % modulus
+
+    return {"math.prod": left_to_right, "product tree": tree}
+
+
+def bench_micro(name, scales, seed, max_seconds, trace_memory):
+    """Run one micro-benchmark over the scale ladder, yielding result dicts."""
+    history = {}
+    stopped = set()
+    for scale in sorted(scales):
+        variants = MICRO_BENCHMARKS[name](scale, random.Random(f"{name}:{scale}:{seed}"))
+        expected = None
+        for variant, fn in variants.items():
+            result = {"micro": name, "variant": variant, "scale": scale}
+            if variant in stopped:
+                continue
+            if history.get(variant) and expected_wall(history[variant], scale) > max_seconds:
+                stopped.add(variant)
+                result["skipped"] = f"expected > {max_seconds}s"
+                yield result
+                continue
+            answer, wall, cpu, peak, error = measure(fn, trace_memory=trace_memory)
+            result.update(answer=answer, wall=wall, cpu=cpu, peak=peak, error=error)
+            if not error:
+                history.setdefault(variant, []).append((scale, wall))
+                if expected is None:
+                    expected = answer
+                elif answer != expected:
+                    result["error"] = f"results differ: {answer} vs {expected}"
+            if result["error"]:
+                stopped.add(variant)
+            yield result
+
+
+def format_micro_result(r):
+    prefix = f"{r['micro']:<20}  {r['variant']:<12}  {r['scale']:>8}"
+    if "skipped" in r:
+        return f"{prefix}  skipped ({r['skipped']})"
+    if r["error"]:
+        return f"{prefix}  {r['error']}"
+    peak = "-" if r["peak"] is None else f"{r['peak'] / 1024:.1f}"
+    return f"{prefix}  {r['wall']:>9.4f}  {r['cpu']:>9.4f}  {peak:>10}  {r['answer']}"
+
+
+def format_result(r):
+    prefix = f"{r['day']:>3}  {r['part']:>4}  {r['scale']:>8}  {r['input_bytes']:>11}"
+    if "skipped" in r:
+        return f"{prefix}  skipped ({r['skipped']})"
+    if r["error"]:
+        return f"{prefix}  {r['error']}"
+    peak = "-" if r["peak"] is None else f"{r['peak'] / 1024:.1f}"
+    known = "ok" if r.get("verified") else "-"
+    return f"{prefix}  {r['wall']:>9.4f}  {r['cpu']:>9.4f}  {peak:>10}  {known:>5}  {r['answer']}"
+
+
+def save_run(output, run):
+    output = Path(output)
+    data = {"runs": []}
+    if output.is_file():
+        with open(output) as f:
+            data = json.load(f)
+    data["runs"].append(run)
+    tmp = output.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    tmp.replace(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*",
+                        help="days to benchmark, e.g. '3' or '5-8' (default: all)")
+    parser.add_argument("--part", type=int, choices=PARTS, action="append",
+                        help="part to run; repeatable (default: both)")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES,
+                        help="input sizes relative to a real input (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="stop a ladder once a run is expected to exceed this")
+    parser.add_argument("--memory", action="store_true",
+                        help="also report peak memory, from a second tracemalloc-traced run")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="JSON file to append results to (default: %(default)s)")
+    parser.add_argument("--engine",
+                        help="alternative implementation to use where a day has one, e.g. numpy")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes a part may use internally, where it supports that")
+    parser.add_argument("--record", action="store_true",
+                        help="store answers for generated inputs without a known answer")
+    parser.add_argument("--input-dir",
+                        help="keep generated inputs here instead of a temporary folder")
+    parser.add_argument("--micro", action="append", choices=sorted(MICRO_BENCHMARKS),
+                        help="run this micro-benchmark instead of the days; repeatable")
+    args = parser.parse_args(argv)
+
+    days = parse_days(args.days) if args.days else available_days()
+    days = [d for d in days if d in GENERATORS]
+    parts = args.part or list(PARTS)
+    scales = [int(s) if float(s).is_integer() else s for s in args.scales]
+
+    # Benchmarks measure parsing too, so never read it back from disk.
+    os.environ.pop(cache.CACHE_DIR_ENV, None)
+
+    run = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": [],
+    }
+    if args.micro:
+        print(f"{'Benchmark':<20}  {'Variant':<12}  {'Scale':>8}  {'Wall (s)':>9}  {'CPU (s)':>9}  {'Peak (KiB)':>10}  Result")
+        status = 0
+        for name in args.micro:
+            for result in bench_micro(name, scales, args.seed, args.max_seconds, args.memory):
+                print(format_micro_result(result), flush=True)
+                run["results"].append(result)
+                if result.get("error"):
+                    status = 1
+        save_run(args.output, run)
+        print(f"Results appended to {args.output}")
+        return status
+
+    store = AnswerStore()
+    status = 0
+    print(f"{'Day':>3}  {'Part':>4}  {'Scale':>8}  {'Bytes':>11}  {'Wall (s)':>9}  {'CPU (s)':>9}  {'Peak (KiB)':>10}  {'Known':>5}  Answer")
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = args.input_dir or tmp
+        Path(input_dir).mkdir(parents=True, exist_ok=True)
+        try:
+            for day in days:
+                for result in bench_day(day, parts, scales, args.seed, args.max_seconds,
+                                        args.memory, input_dir, store, args.record,
+                                        args.engine, args.workers):
+                    print(format_result(result), flush=True)
+                    run["results"].append(result)
+        except AnswerMismatch as e:
+            print(f"WRONG ANSWER: {e}")
+            status = 1
+        finally:
+            store.save()
+
+    save_run(args.output, run)
+    print(f"Results appended to {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Parse-once caching for the day solutions.
+
+A day decorates its parse step (and any expensive structure derived
+from it) with ``parse_cache``. The decorated function takes the input
+path and runs at most once per input file contents, so ``part1`` and
+``part2`` share one parse when run in the same interpreter.
+
+If the ``AOC_PARSE_CACHE`` environment variable names a directory,
+results are also pickled there, keyed by the SHA-256 of the input file
+and of the solution's source file, so repeated runs skip parsing
+entirely and editing a solution invalidates its entries.
+
+Cached results are shared between callers and must not be mutated.
+"""
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from aoc import instrument
+
+CACHE_DIR_ENV = "AOC_PARSE_CACHE"
+
+_memory = {}
+_source_digests = {}
+_depth = 0  # parse steps currently running, to time only the outermost
+
+
+def _source_digest(filename):
+    if filename not in _source_digests:
+        _source_digests[filename] = hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+    return _source_digests[filename]
+
+
+def clear():
+    """Drop all in-process cached results (the on-disk cache is kept)."""
+    _memory.clear()
+
+
+def parse_cache(fn):
+    source = fn.__code__.co_filename
+
+    @functools.wraps(fn)
+    def wrapper(path):
+        global _depth
+        path = Path(path)
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            # Let the parse step report missing/unreadable files itself.
+            return fn(path)
+
+        key = (source, fn.__qualname__, digest)
+        if key in _memory:
+            instrument.count("parse_cache.memory_hits")
+            return _memory[key]
+
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+        cache_file = None
+        if cache_dir:
+            source_path = Path(source).resolve()
+            name = "-".join([
+                source_path.parent.parent.name,
+                source_path.stem,
+                fn.__qualname__,
+                _source_digest(source)[:12],
+                digest[:24],
+            ])
+            cache_file = Path(cache_dir) / f"{name}.pickle"
+            if cache_file.is_file():
+                with open(cache_file, "rb") as f:
+                    result = pickle.load(f)
+                instrument.count("parse_cache.disk_hits")
+                _memory[key] = result
+                return result
+
+        # A parse step run from inside another (Day-04's parse_array calling
+        # parse) is already timed by the outer phase; timing it again would
+        # count it twice in the parse total.
+        if _depth:
+            phase = contextlib.nullcontext()
+        else:
+            phase = instrument.phase(f"parse.{fn.__qualname__}")
+        _depth += 1
+        try:
+            with phase:
+                result = fn(path)
+        finally:
+            _depth -= 1
+        _memory[key] = result
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(cache_file)
+        return result
+
+    return wrapper
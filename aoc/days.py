@@ -0,0 +1,160 @@
+"""Discovery and loading of the per-day Python solutions.
+
+Each day lives in ``Day-NN/Python/``. Most days define ``part1`` and
+``part2`` in ``solution.py``; Day-10 splits them into ``part1.py`` and
+``part2.py`` (with ``solution.py`` only gluing them together), and
+Day-12 has a single part. Every part takes an input filename that is
+resolved relative to the ``Day-NN/`` folder.
+
+Days with alternative implementations list them in a module-level
+``ENGINES`` tuple (default first); the parts that take an ``engine``
+keyword argument accept those engines. Days whose parts have different
+engines map each part to its own tuple instead. Parts that can spread their own
+work over a process pool take a ``workers`` keyword argument, and
+submit their worker functions through ``call_in_module``.
+"""
+import importlib.util
+import inspect
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PARTS = (1, 2)
+
+# Rough relative cost of each part on a real input, used to start the
+# slowest jobs first when running in parallel. Unlisted parts count as 1.
+EXPECTED_COST = {
+    (12, 1): 50,  # region packing backtracking
+    (10, 2): 6,   # one MILP per machine
+    (9, 2): 2,
+    (8, 2): 2,    # nearest edges until one circuit
+    (10, 1): 2,
+}
+
+
+def day_dir(number):
+    return REPO_ROOT / f"Day-{number:02d}"
+
+
+def available_days():
+    """Return the sorted day numbers that have a Python solution."""
+    days = []
+    for path in REPO_ROOT.glob("Day-*/Python"):
+        try:
+            days.append(int(path.parent.name.split("-")[1]))
+        except ValueError:
+            continue
+    return sorted(days)
+
+
+_worker_modules = {}
+
+
+def call_in_module(path, name, *args):
+    """Call the function ``name`` of the solution module at ``path``.
+
+    Process pools pickle functions by module name, and a day loaded
+    here is registered under a name (``aoc_day01``) that a worker
+    started with the ``spawn`` method cannot import. Submitting this
+    function with the module's path instead lets each worker load the
+    module itself, once per process.
+    """
+    path = str(Path(path).resolve())
+    module = _worker_modules.get(path)
+    if module is None:
+        # Reuse the module if this process already has it (forked workers).
+        for candidate in list(sys.modules.values()):
+            filename = getattr(candidate, "__file__", None)
+            if filename and str(Path(filename).resolve()) == path:
+                module = candidate
+                break
+        else:
+            directory = Path(path).parent.parent.name
+            module = _load_module(f"aoc_worker_{directory}_{Path(path).stem}", path)
+        _worker_modules[path] = module
+    return getattr(module, name)(*args)
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+class Day:
+    """The loaded ``part1``/``part2`` callables for a single day.
+
+    Modules are imported once, under unique names (every day calls its
+    file ``solution.py``). Parts whose module fails to import, e.g.
+    because of a missing optional dependency, are recorded in
+    ``errors`` instead of ``parts``.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.directory = day_dir(number)
+        self.parts = {}
+        self.engines = {}
+        self.modules = {}
+        self.parameters = {}
+        self.errors = {}
+
+        python_dir = self.directory / "Python"
+        split_modules = {part: python_dir / f"part{part}.py" for part in PARTS}
+        if any(path.exists() for path in split_modules.values()):
+            for part, path in split_modules.items():
+                if path.exists():
+                    self._load_part(part, f"aoc_day{number:02d}_part{part}", path)
+        else:
+            self._load_part(None, f"aoc_day{number:02d}", python_dir / "solution.py")
+
+    def _load_part(self, part, name, path):
+        wanted = PARTS if part is None else (part,)
+        try:
+            module = _load_module(name, path)
+        except Exception as e:
+            for p in wanted:
+                self.errors[p] = e
+            return
+        for p in wanted:
+            fn = getattr(module, f"part{p}", None)
+            if fn is not None:
+                self.parts[p] = fn
+                self.modules[p] = module
+                self.parameters[p] = tuple(inspect.signature(fn).parameters)
+                engines = getattr(module, "ENGINES", ())
+                if isinstance(engines, dict):
+                    engines = engines.get(p, ())
+                if "engine" in self.parameters[p]:
+                    self.engines[p] = tuple(engines)
+                else:
+                    self.engines[p] = ()
+
+    def input_name(self, name, part):
+        """Resolve an input name such as ``example`` for one part.
+
+        Days whose examples differ between parts (Day-11) ship
+        ``example_part1``/``example_part2``; those are preferred over
+        the plain name. Returns None if no matching file exists.
+        """
+        for candidate in (f"{name}_part{part}", name):
+            if (self.directory / candidate).is_file():
+                return candidate
+        return None
+
+
+_loaded = {}
+
+
+def load_day(number):
+    """Import a day's solution modules, reusing earlier imports."""
+    if number not in _loaded:
+        _loaded[number] = Day(number)
+    return _loaded[number]
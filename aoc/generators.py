@@ -0,0 +1,231 @@
+"""Synthetic, puzzle-shaped input generators for every day.
+
+``generate(day, scale, seed)`` returns the text of a valid input for
+that day. ``scale=1`` is roughly the size of a real puzzle input;
+larger scales grow the input linearly in its natural unit (lines,
+items, or grid cells). Output is deterministic for a given
+(day, scale, seed).
+"""
+import math
+import random
+import string
+
+# Day-12 uses the shapes from its example; real inputs have six 3x3 shapes too.
+DAY12_SHAPES = [
+    ["###", "##.", "##."],
+    ["###", "##.", ".##"],
+    [".##", "###", "##."],
+    ["##.", "###", "##."],
+    ["###", "#..", "###"],
+    ["###", ".#.", "###"],
+]
+
+
+def _count(base, scale):
+    return max(1, round(base * scale))
+
+
+def _side(base, scale):
+    return max(3, round(base * math.sqrt(scale)))
+
+
+def day01(scale, rng):
+    lines = []
+    for _ in range(_count(4500, scale)):
+        lines.append(f"{rng.choice('LR')}{rng.randint(1, 999)}")
+    return "\n".join(lines) + "\n"
+
+
+def day02(scale, rng):
+    # Disjoint ranges of up to 10 digits, like the real input. Neither
+    # engine caps the digit count any more, but widening the ranges would
+    # change the generated inputs whose answers are already recorded.
+    ranges = []
+    for _ in range(_count(35, scale)):
+        digits = rng.randint(2, 10)
+        start = rng.randint(10 ** (digits - 1), 10 ** digits - 1)
+        end = min(10 ** 10 - 1, start + rng.randint(0, 10 ** (digits - 2)))
+        ranges.append((start, end))
+    ranges.sort()
+    disjoint = []
+    for start, end in ranges:
+        if disjoint and start <= disjoint[-1][1]:
+            continue
+        disjoint.append((start, end))
+    rng.shuffle(disjoint)
+    return ",".join(f"{s}-{e}" for s, e in disjoint) + "\n"
+
+
+def day03(scale, rng):
+    lines = []
+    for _ in range(_count(200, scale)):
+        lines.append("".join(rng.choice("123456789") for _ in range(100)))
+    return "\n".join(lines) + "\n"
+
+
+def day04(scale, rng):
+    side = _side(137, scale)
+    lines = []
+    for _ in range(side):
+        lines.append("".join("@" if rng.random() < 0.6 else "." for _ in range(side)))
+    return "\n".join(lines) + "\n"
+
+
+def day05(scale, rng):
+    limit = 5 * 10 ** 14
+    lines = []
+    for _ in range(_count(190, scale)):
+        start = rng.randint(1, limit)
+        lines.append(f"{start}-{start + rng.randint(0, 10 ** 12)}")
+    lines.append("")
+    for _ in range(_count(1000, scale)):
+        lines.append(str(rng.randint(1, limit)))
+    return "\n".join(lines) + "\n"
+
+
+def day06(scale, rng):
+    # Each problem block has one full-width number so no column inside
+    # a block is blank, and all numbers in a block share an alignment.
+    num_rows = 4
+    rows = [[] for _ in range(num_rows + 1)]
+    for _ in range(_count(1000, scale)):
+        width = rng.randint(1, 4)
+        full_row = rng.randrange(num_rows)
+        align = str.ljust if rng.random() < 0.5 else str.rjust
+        for r in range(num_rows):
+            digits = width if r == full_row else rng.randint(1, width)
+            number = str(rng.randint(10 ** (digits - 1), 10 ** digits - 1))
+            rows[r].append(align(number, width))
+        rows[num_rows].append(rng.choice("+*").ljust(width))
+    return "\n".join(" ".join(row) for row in rows) + "\n"
+
+
+def day07(scale, rng):
+    width = _side(141, scale) | 1
+    height = _side(142, scale)
+    lines = ["." * (width // 2) + "S" + "." * (width // 2)]
+    for r in range(1, height):
+        if r % 2 == 0:
+            lines.append("".join("^" if rng.random() < 0.3 else "." for _ in range(width)))
+        else:
+            lines.append("." * width)
+    return "\n".join(lines) + "\n"
+
+
+def day08(scale, rng):
+    lines = []
+    for _ in range(max(3, _count(1000, scale))):
+        lines.append(",".join(str(rng.randrange(100000)) for _ in range(3)))
+    return "\n".join(lines) + "\n"
+
+
+def day09(scale, rng):
+    # An x-monotone rectilinear polygon: a top staircase walked left to
+    # right, then a bottom staircase walked back. Every top height is
+    # above every bottom height, so the outline never crosses itself.
+    slabs = _count(124, scale)
+    span = 100000 * max(1, math.ceil(scale))
+    xs = sorted(rng.sample(range(span), slabs + 1))
+    mid = span // 2
+
+    def heights(lo, hi):
+        values = [rng.randrange(lo, hi)]
+        while len(values) < slabs:
+            h = rng.randrange(lo, hi)
+            if h != values[-1]:
+                values.append(h)
+        return values
+
+    tops = heights(mid + 1, span)
+    bottoms = heights(0, mid)
+    points = []
+    for i in range(slabs):
+        points.append((xs[i], tops[i]))
+        points.append((xs[i + 1], tops[i]))
+    for i in reversed(range(slabs)):
+        points.append((xs[i + 1], bottoms[i]))
+        points.append((xs[i], bottoms[i]))
+    return "\n".join(f"{x},{y}" for x, y in points) + "\n"
+
+
+def day10(scale, rng):
+    lines = []
+    for _ in range(_count(180, scale)):
+        num_lights = rng.randint(4, 10)
+        num_buttons = rng.randint(num_lights - 2, 10)
+        buttons = [
+            sorted(rng.sample(range(num_lights), rng.randint(1, num_lights - 1)))
+            for _ in range(num_buttons)
+        ]
+        lights = [0] * num_lights
+        for button in buttons:
+            if rng.random() < 0.5:
+                for light in button:
+                    lights[light] ^= 1
+        joltage = [0] * num_lights
+        for button in buttons:
+            presses = rng.randint(0, 30)
+            for light in button:
+                joltage[light] += presses
+        diagram = "".join("#" if on else "." for on in lights)
+        schematics = " ".join("(" + ",".join(map(str, b)) + ")" for b in buttons)
+        lines.append(f"[{diagram}] {schematics} {{{','.join(map(str, joltage))}}}")
+    return "\n".join(lines) + "\n"
+
+
+def day11(scale, rng):
+    # A random DAG in topological order with the named devices spread
+    # along it; every device except 'out' has at least one output.
+    count = max(10, _count(600, scale))
+    reserved = {"svr", "you", "fft", "dac", "out"}
+    names = set()
+    while len(names) < count - len(reserved):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(3))
+        if name not in reserved:
+            names.add(name)
+    nodes = sorted(names)
+    rng.shuffle(nodes)
+    nodes.insert(0, "svr")
+    nodes.insert(count // 10, "you")
+    nodes.insert(count // 3, "fft")
+    nodes.insert(2 * count // 3, "dac")
+    nodes.append("out")
+
+    lines = []
+    for i, node in enumerate(nodes[:-1]):
+        later = nodes[i + 1:i + 31]
+        outputs = rng.sample(later, min(len(later), rng.randint(1, 3)))
+        lines.append(f"{node}: {' '.join(outputs)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def day12(scale, rng):
+    # Like the real input, each region either clearly fits (no more
+    # pieces than 3x3 cells) or clearly doesn't (too little area).
+    parts = []
+    for i, shape in enumerate(DAY12_SHAPES):
+        parts.append(f"{i}:\n" + "\n".join(shape) + "\n")
+    regions = []
+    for _ in range(_count(1000, scale)):
+        w, h = rng.randint(35, 50), rng.randint(35, 50)
+        if rng.random() < 0.5:
+            total = rng.randint(1, (w // 3) * (h // 3))
+        else:
+            total = (w * h) // 7 + rng.randint(1, 20)
+        counts = [0] * len(DAY12_SHAPES)
+        for _ in range(total):
+            counts[rng.randrange(len(counts))] += 1
+        regions.append(f"{w}x{h}: {' '.join(map(str, counts))}")
+    return "\n".join(parts) + "\n" + "\n".join(regions) + "\n"
+
+
+GENERATORS = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06,
+    7: day07, 8: day08, 9: day09, 10: day10, 11: day11, 12: day12,
+}
+
+
+def generate(day, scale, seed=0):
+    rng = random.Random(f"{day}:{scale}:{seed}")
+    return GENERATORS[day](scale, rng)
@@ -0,0 +1,108 @@
+"""Opt-in instrumentation for the day solutions.
+
+Instrumentation is off unless the ``AOC_INSTRUMENT`` environment
+variable is set to something other than ``0`` (the runner's
+``--instrument`` flag does this). When on:
+
+* ``phase(name)`` times a block of code into ``timers[name]``; the
+  parse cache uses it for every outermost parse step that actually runs.
+* ``count(name, n)`` adds to a named counter. Hot loops should count
+  into a local variable and call ``count`` once at the end, e.g.
+  Day-12's backtracking nodes or Day-10's BFS states.
+
+``profiled`` and ``memory_snapshot`` wrap a single call in cProfile or
+tracemalloc and dump the stats to disk; they work whether or not
+instrumentation is enabled.
+"""
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+
+ENV = "AOC_INSTRUMENT"
+
+enabled = os.environ.get(ENV, "") not in ("", "0")
+counters = Counter()
+timers = defaultdict(float)
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def reset():
+    counters.clear()
+    timers.clear()
+
+
+def snapshot():
+    """Return a plain-dict copy of the current counters and timers."""
+    return {"counters": dict(counters), "timers": dict(timers)}
+
+
+def count(name, n=1):
+    if enabled:
+        counters[name] += n
+
+
+@contextlib.contextmanager
+def phase(name):
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timers[name] += time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def profiled(path, top=25):
+    """Run the block under cProfile.
+
+    Raw stats go to ``path`` (load them with pstats or snakeviz) and
+    the ``top`` entries by cumulative time to ``path`` with a .txt suffix.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        path.with_suffix(".txt").write_text(out.getvalue())
+
+
+@contextlib.contextmanager
+def memory_snapshot(path, top=25):
+    """Take a tracemalloc snapshot at the end of the block.
+
+    The snapshot goes to ``path`` (load it with
+    ``tracemalloc.Snapshot.load``) and the ``top`` allocation sites by
+    size to ``path`` with a .txt suffix.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        snap = tracemalloc.take_snapshot()
+        if started:
+            tracemalloc.stop()
+        snap.dump(str(path))
+        lines = [str(stat) for stat in snap.statistics("lineno")[:top]]
+        path.with_suffix(".txt").write_text("\n".join(lines) + "\n")
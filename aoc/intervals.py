@@ -0,0 +1,194 @@
+"""Sets of integers stored as sorted, disjoint, inclusive ranges.
+
+Several days give their input as a list of inclusive ``start-end``
+ranges (Day-02 product IDs, Day-05 fresh ingredients) and then ask
+which numbers fall inside them. ``IntervalSet`` merges the ranges once
+and answers membership with a binary search over the range starts.
+
+``MutableIntervalSet`` adds ranges and removes them in place, for sets
+that change between queries, and keeps its covered count up to date.
+
+Batch queries given as a NumPy array are answered with
+``np.searchsorted``; NumPy is optional and only used for such arrays.
+"""
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class IntervalSet:
+    """A set of integers given as inclusive ``(start, end)`` ranges.
+
+    Overlapping and adjacent ranges are merged on construction, so
+    iterating yields sorted, disjoint ranges with gaps between them.
+    """
+
+    def __init__(self, ranges=()):
+        starts = []
+        ends = []
+        for s, e in sorted(ranges):
+            if starts and s <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+        self.starts = starts
+        self.ends = ends
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        """Number of disjoint ranges (not the number of integers covered)."""
+        return len(self.starts)
+
+    def __repr__(self):
+        return f"IntervalSet({list(self)!r})"
+
+    def contains(self, x):
+        """Whether ``x`` lies in one of the ranges, in O(log R)."""
+        i = bisect_right(self.starts, x) - 1
+        return i >= 0 and x <= self.ends[i]
+
+    __contains__ = contains
+
+    def members(self, values):
+        """Yield the values that lie in the set, in the order given.
+
+        Ascending input is merged against the ranges in a single pass;
+        whenever a value is smaller than the one before it, the walk
+        restarts from a binary search, so any order gives correct results.
+        """
+        starts, ends = self.starts, self.ends
+        n = len(starts)
+        i = 0
+        previous = None
+        for x in values:
+            if previous is not None and x < previous:
+                i = max(bisect_right(starts, x) - 1, 0)
+            previous = x
+            while i < n and ends[i] < x:
+                i += 1
+            if i == n:
+                # Past the last range: with ascending input nothing later
+                # can match either, but a descending value may still.
+                continue
+            if starts[i] <= x:
+                yield x
+
+    def contains_many(self, values):
+        """Membership of every value, in the order given.
+
+        A list of bools; the values are sorted and swept against the
+        ranges in one pass. For a NumPy array the answer is a bool array
+        computed with ``np.searchsorted``, with no per-value Python work.
+        """
+        if np is not None and isinstance(values, np.ndarray):
+            if not self.starts:
+                return np.zeros(len(values), dtype=bool)
+            starts = np.asarray(self.starts, dtype=values.dtype)
+            ends = np.asarray(self.ends, dtype=values.dtype)
+            i = np.searchsorted(starts, values, side="right") - 1
+            return (i >= 0) & (values <= ends[np.maximum(i, 0)])
+
+        starts, ends = self.starts, self.ends
+        n = len(starts)
+        result = [False] * len(values)
+        i = 0
+        for k in sorted(range(len(values)), key=values.__getitem__):
+            x = values[k]
+            while i < n and ends[i] < x:
+                i += 1
+            if i == n:
+                break
+            result[k] = starts[i] <= x
+        return result
+
+    def count_in(self, values):
+        """How many of ``values`` lie in the set (duplicates count each time)."""
+        return sum(1 for _ in self.members(values))
+
+    def sum_in(self, values):
+        """The sum of the ``values`` that lie in the set."""
+        return sum(self.members(values))
+
+    def count_covered(self):
+        """Number of integers covered by the ranges."""
+        return sum(e - s + 1 for s, e in self)
+
+    def union(self, other):
+        """The integers in either set."""
+        return IntervalSet([*self, *other])
+
+    def intersect(self, other):
+        """The integers in both sets, by a merge over the two range lists."""
+        ranges = []
+        a, b = list(self), list(other)
+        i = j = 0
+        while i < len(a) and j < len(b):
+            s = max(a[i][0], b[j][0])
+            e = min(a[i][1], b[j][1])
+            if s <= e:
+                ranges.append((s, e))
+            # Drop whichever range ends first; the other may overlap more.
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(ranges)
+
+    __or__ = union
+    __and__ = intersect
+
+
+class MutableIntervalSet(IntervalSet):
+    """An IntervalSet that ranges can be added to and removed from.
+
+    The ranges stay in sorted starts/ends lists, so every query of
+    IntervalSet still applies. An update binary-searches for the ranges
+    it touches and splices them out in one slice assignment, and the
+    number of covered integers is kept as a running total.
+    """
+
+    def __init__(self, ranges=()):
+        super().__init__(ranges)
+        self.covered = super().count_covered()
+
+    def count_covered(self):
+        """Number of integers covered by the ranges, in O(1)."""
+        return self.covered
+
+    def add_range(self, start, end):
+        """Add the integers in [start, end]."""
+        starts, ends = self.starts, self.ends
+        # Ranges overlapping or adjacent to [start, end] are merged into it.
+        i = bisect_left(ends, start - 1)
+        j = bisect_right(starts, end + 1)
+        if i < j:
+            start = min(start, starts[i])
+            end = max(end, ends[j - 1])
+            self.covered -= sum(e - s + 1 for s, e in zip(starts[i:j], ends[i:j]))
+        starts[i:j] = [start]
+        ends[i:j] = [end]
+        self.covered += end - start + 1
+
+    def remove_range(self, start, end):
+        """Remove the integers in [start, end]; they need not all be present."""
+        starts, ends = self.starts, self.ends
+        i = bisect_left(ends, start)
+        j = bisect_right(starts, end)
+        if i >= j:
+            return
+        self.covered -= sum(e - s + 1 for s, e in zip(starts[i:j], ends[i:j]))
+        # Keep whatever sticks out on either side of the removed range.
+        kept = []
+        if starts[i] < start:
+            kept.append((starts[i], start - 1))
+        if ends[j - 1] > end:
+            kept.append((end + 1, ends[j - 1]))
+        starts[i:j] = [s for s, _ in kept]
+        ends[i:j] = [e for _, e in kept]
+        self.covered += sum(e - s + 1 for s, e in kept)
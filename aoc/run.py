@@ -0,0 +1,328 @@
+"""Run any selection of days, parts and inputs in a single interpreter.
+
+Usage (from the repository root):
+
+    python3 -m aoc.run                      # every day, both parts, example + input
+    python3 -m aoc.run 1 3 5-8 --part 2     # a subset of days, part 2 only
+    python3 -m aoc.run 8 --input input      # just the real input
+    python3 -m aoc.run --parse-cache .cache # reuse parsed inputs across runs
+    python3 -m aoc.run -j 8                 # spread parts over 8 processes
+    python3 -m aoc.run 1 --engine numpy     # use an alternative implementation
+    python3 -m aoc.run 1 --engine chunked --workers 4  # parallelize within a part
+
+Each day is imported once, and every part is timed individually
+(wall-clock and CPU time). Pass --memory to also report each part's
+peak Python memory; that takes a second, tracemalloc-traced run of
+the part, since tracing slows allocation-heavy code down too much to
+time the same call.
+
+For digging into a slow part, --instrument reports the time spent
+parsing and the counters the solutions expose (e.g. Day-12 backtracking
+nodes), while --profile DIR and --snapshot DIR dump cProfile stats and
+a tracemalloc snapshot for every part that runs.
+
+Answers are checked against the known-good answers in
+aoc/answers.json, and the run stops at the first mismatch. Pass
+--record to add answers for inputs that have none yet.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from aoc import cache, instrument
+from aoc.answers import AnswerMismatch, AnswerStore
+from aoc.cache import CACHE_DIR_ENV
+from aoc.days import EXPECTED_COST, PARTS, available_days, load_day
+
+NO_ANSWER = "no answer"
+
+Measurement = namedtuple(
+    "Measurement",
+    ["day", "part", "input", "answer", "wall", "cpu", "peak", "error", "verified", "stats",
+     "engine"],
+    defaults=[None, None, None],
+)
+
+
+def parse_days(specs):
+    """Expand day specs like ``["1", "5-8"]`` into sorted day numbers."""
+    days = set()
+    for spec in specs:
+        if "-" in spec:
+            lo, hi = map(int, spec.split("-", 1))
+            days.update(range(lo, hi + 1))
+        else:
+            days.add(int(spec))
+    return sorted(days)
+
+
+def measure(fn, *args, trace_memory=False, wrappers=(), **kwargs):
+    """Call ``fn(*args, **kwargs)`` and time it.
+
+    The return value is the answer. Anything the part prints is
+    captured; if it returns no answer, the last printed line (usually
+    an error message) is reported as the error. ``wrappers`` are extra
+    context managers (e.g. a profiler) entered around the call.
+
+    With ``trace_memory``, ``fn`` is called a second time under
+    tracemalloc for the peak memory, so the timings come from an
+    untraced call. The parse cache is cleared first so the peak
+    includes parsing, and instrumentation is paused so counters
+    are not doubled.
+    Returns ``(answer, wall, cpu, peak, error)``.
+    """
+    out = io.StringIO()
+    answer = None
+    error = None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(contextlib.redirect_stdout(out))
+            for wrapper in wrappers:
+                stack.enter_context(wrapper)
+            answer = fn(*args, **kwargs)
+    except (Exception, SystemExit) as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    peak = None
+    if trace_memory and error is None:
+        peak = traced_peak(fn, *args, **kwargs)
+
+    if answer is None and error is None:
+        lines = [line for line in out.getvalue().splitlines() if line.strip()]
+        error = f"{NO_ANSWER}: {lines[-1].strip()}" if lines else NO_ANSWER
+    return answer, wall, cpu, peak, error
+
+
+def traced_peak(fn, *args, **kwargs):
+    """Peak traced memory of one more call of ``fn``, output discarded."""
+    cache.clear()
+    was_enabled = instrument.enabled
+    instrument.enable(False)
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(*args, **kwargs)
+    except (Exception, SystemExit):
+        pass
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        instrument.enable(was_enabled)
+    return peak
+
+
+def run_part(day_number, part, input_name, trace_memory=False, profile_dir=None,
+             snapshot_dir=None, engine=None, workers=1):
+    """Run and time one part; returns None if the day has no such part.
+
+    ``engine`` is only passed to parts that list it in their module's
+    ENGINES; other parts run their default implementation. ``workers``
+    is only passed to parts that take it. With
+    instrumentation enabled, the counters and timers collected during
+    the part are attached as ``stats``.
+    """
+    day = load_day(day_number)
+    if part in day.errors:
+        error = day.errors[part]
+        return Measurement(day_number, part, input_name, None, None, None, None,
+                           f"import failed: {type(error).__name__}: {error}")
+    if part not in day.parts:
+        return None
+    filename = day.input_name(input_name, part)
+    if filename is None:
+        return Measurement(day_number, part, input_name, None, None, None, None,
+                           "no input file")
+    stem = f"day{day_number:02d}-part{part}-{input_name}"
+    wrappers = []
+    if profile_dir:
+        wrappers.append(instrument.profiled(Path(profile_dir) / f"{stem}.prof"))
+    if snapshot_dir:
+        wrappers.append(instrument.memory_snapshot(Path(snapshot_dir) / f"{stem}.snapshot"))
+    kwargs = {}
+    if engine is not None and engine in day.engines.get(part, ()):
+        kwargs["engine"] = engine
+    if workers > 1 and "workers" in day.parameters.get(part, ()):
+        kwargs["workers"] = workers
+    instrument.reset()
+    answer, wall, cpu, peak, error = measure(day.parts[part], filename,
+                                             trace_memory=trace_memory, wrappers=wrappers,
+                                             **kwargs)
+    stats = instrument.snapshot() if instrument.enabled else None
+    return Measurement(day_number, part, input_name, answer, wall, cpu, peak, error,
+                       stats=stats, engine=kwargs.get("engine"))
+
+
+def verify(m, store, record=False):
+    """Check a measurement's answer against the store (raising
+    AnswerMismatch) and, if ``record`` is set, record it."""
+    if m.error:
+        return m
+    verified = store.check(m.day, m.part, m.input, m.answer)
+    if record:
+        store.record(m.day, m.part, m.input, m.answer)
+    return m._replace(verified=verified)
+
+
+def job_cost(job):
+    """Sort key that puts the longest expected jobs first."""
+    day_number, part, input_name = job
+    day = load_day(day_number)
+    filename = day.input_name(input_name, part)
+    size = (day.directory / filename).stat().st_size if filename else 0
+    return EXPECTED_COST.get((day_number, part), 1), size
+
+
+def run_sequential(jobs, measurements, store, record, **options):
+    for job in jobs:
+        m = run_part(*job, **options)
+        if m is not None:
+            measurements.append(verify(m, store, record))
+
+
+def run_parallel(jobs, measurements, store, record, processes, **options):
+    """Fan the jobs out over ``processes`` worker processes, longest
+    expected job first.
+
+    Answers are checked as results arrive; on a wrong answer the jobs
+    that haven't started yet are cancelled.
+    """
+    ordered = sorted(jobs, key=job_cost, reverse=True)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_part, *job, **options) for job in ordered]
+        try:
+            for future in as_completed(futures):
+                m = future.result()
+                if m is not None:
+                    measurements.append(verify(m, store, record))
+        except AnswerMismatch:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+
+def format_stats(m):
+    """Indented lines for an instrumented measurement: parse vs. solve
+    time, then every counter."""
+    parse = sum(t for name, t in m.stats["timers"].items() if name.startswith("parse."))
+    lines = [f"{'':>11}parse {parse:.4f}s, solve {m.wall - parse:.4f}s"]
+    for name, t in sorted(m.stats["timers"].items()):
+        lines.append(f"{'':>13}{name}: {t:.4f}s")
+    for name, n in sorted(m.stats["counters"].items()):
+        lines.append(f"{'':>13}{name}: {n}")
+    return lines
+
+
+def format_report(measurements, elapsed=None):
+    header = f"{'Day':>3}  {'Part':>4}  {'Input':<10}  {'Answer':<20}  {'Wall (s)':>9}  {'CPU (s)':>9}  {'Peak (KiB)':>10}  Known  Engine"
+    lines = [header, "-" * len(header)]
+    for m in measurements:
+        if m.error:
+            lines.append(f"{m.day:>3}  {m.part:>4}  {m.input:<10}  {m.error}")
+            continue
+        peak = "-" if m.peak is None else f"{m.peak / 1024:.1f}"
+        known = "ok" if m.verified else "-"
+        lines.append((
+            f"{m.day:>3}  {m.part:>4}  {m.input:<10}  {str(m.answer):<20}  "
+            f"{m.wall:>9.4f}  {m.cpu:>9.4f}  {peak:>10}  {known:<5}  {m.engine or ''}"
+        ).rstrip())
+        if m.stats is not None:
+            lines.extend(format_stats(m))
+    timed = [m for m in measurements if m.wall is not None]
+    lines.append("-" * len(header))
+    summary = (
+        f"{len(timed)} parts run, total wall {sum(m.wall for m in timed):.4f}s, "
+        f"total CPU {sum(m.cpu for m in timed):.4f}s"
+    )
+    if elapsed is not None:
+        summary += f", elapsed {elapsed:.4f}s"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*",
+                        help="days to run, e.g. '3' or '5-8' (default: all)")
+    parser.add_argument("--part", type=int, choices=PARTS, action="append",
+                        help="part to run; repeatable (default: both)")
+    parser.add_argument("--input", action="append",
+                        help="input file name in Day-NN/; repeatable (default: example and input)")
+    parser.add_argument("--memory", action="store_true",
+                        help="also report peak memory, from a second tracemalloc-traced run of each part")
+    parser.add_argument("--record", action="store_true",
+                        help="store answers for inputs without a known answer")
+    parser.add_argument("--parse-cache", metavar="DIR",
+                        help=f"pickle parsed inputs to DIR (same as setting {CACHE_DIR_ENV})")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="run parts in this many worker processes (default: 1, in-process)")
+    parser.add_argument("--engine",
+                        help="alternative implementation to use where a day has one, e.g. numpy")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes a part may use internally, where it supports that")
+    parser.add_argument("--instrument", action="store_true",
+                        help=f"report parse/solve times and counters (same as setting {instrument.ENV}=1)")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="run each part under cProfile and dump the stats to DIR")
+    parser.add_argument("--snapshot", metavar="DIR",
+                        help="dump a tracemalloc snapshot of each part to DIR")
+    args = parser.parse_args(argv)
+
+    if args.parse_cache:
+        os.environ[CACHE_DIR_ENV] = args.parse_cache
+    if args.instrument:
+        # Set in the environment too so worker processes pick it up.
+        os.environ[instrument.ENV] = "1"
+        instrument.enable()
+
+    days = parse_days(args.days) if args.days else available_days()
+    parts = args.part or list(PARTS)
+    inputs = args.input or ["example", "input"]
+    jobs = [(day, part, input_name)
+            for day in days for input_name in inputs for part in parts]
+
+    store = AnswerStore()
+    measurements = []
+    status = 0
+    start = time.perf_counter()
+    options = {
+        "trace_memory": args.memory,
+        "profile_dir": args.profile,
+        "snapshot_dir": args.snapshot,
+        "engine": args.engine,
+        "workers": args.workers,
+    }
+    try:
+        if args.jobs > 1:
+            run_parallel(jobs, measurements, store, args.record, args.jobs, **options)
+        else:
+            run_sequential(jobs, measurements, store, args.record, **options)
+    except AnswerMismatch as e:
+        mismatch = e
+        status = 1
+    else:
+        mismatch = None
+        if any(m.error and m.error != "no input file" for m in measurements):
+            status = 1
+    finally:
+        store.save()
+    elapsed = time.perf_counter() - start
+
+    order = {job: i for i, job in enumerate(jobs)}
+    measurements.sort(key=lambda m: order[(m.day, m.part, m.input)])
+    print(format_report(measurements, elapsed))
+    if mismatch is not None:
+        print(f"WRONG ANSWER: {mismatch}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())